@@ -1,14 +1,28 @@
-from pyiron_database.generic_storage.hdf5_storage import HDF5Group, HDF5Storage
+from pyiron_database.generic_storage.codecs import CodecRegistry, codec_registry
+from pyiron_database.generic_storage.hdf5_storage import (
+    HDF5Group,
+    HDF5Storage,
+    HDF5StoragePolicy,
+    LazyDataset,
+    set_default_policy,
+)
+from pyiron_database.generic_storage.indexed_file import IndexedFile
 from pyiron_database.generic_storage.interface import StorageGroup
 from pyiron_database.generic_storage.json_storage import JSONGroup, JSONStorage
 from pyiron_database.generic_storage.pickle_storage import PickleGroup, PickleStorage
 
 __all__ = [
+    "CodecRegistry",
     "StorageGroup",
     "HDF5Group",
     "HDF5Storage",
+    "HDF5StoragePolicy",
+    "IndexedFile",
     "JSONGroup",
     "JSONStorage",
+    "LazyDataset",
     "PickleGroup",
     "PickleStorage",
+    "codec_registry",
+    "set_default_policy",
 ]
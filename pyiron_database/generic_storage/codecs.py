@@ -0,0 +1,283 @@
+from __future__ import annotations
+
+import dataclasses
+from base64 import b64decode, b64encode
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Any
+
+from pyiron_database.generic_storage.dataclass_helpers import unwrap_dataclass
+from pyiron_database.obj_reconstruction.util import recreate_type
+
+if TYPE_CHECKING:
+    from pyiron_database.generic_storage.interface import StorageGroup
+
+Encoder = Callable[["StorageGroup", str, Any], None]
+Decoder = Callable[["StorageGroup"], Any]
+
+
+def _recreate_class(group: StorageGroup) -> Any:
+    module, qualname, version = group["_class"].split(group.separator)
+    return recreate_type(module, qualname, version)
+
+
+def _encode_type(group: StorageGroup, key: str, value: Any) -> None:
+    sub = group.create_group(key)
+    sub["_type"] = "type"
+    sub["_class"] = group._class_path(value)
+
+
+def _encode_tuple(group: StorageGroup, key: str, value: tuple) -> None:
+    sub = group.create_group(key)
+    sub["_type"] = "tuple"
+    for i, v in enumerate(value):
+        sub[f"item_{i}"] = v
+
+
+def _decode_tuple(group: StorageGroup) -> tuple:
+    lst = []
+    i = 0
+    while f"item_{i}" in group:
+        lst.append(group[f"item_{i}"])
+        i += 1
+    return tuple(lst)
+
+
+def _encode_dict(group: StorageGroup, key: str, value: dict) -> None:
+    sub = group.create_group(key)
+    for k, v in value.items():
+        sub[k] = v
+
+
+def _encode_bytes(group: StorageGroup, key: str, value: bytes) -> None:
+    sub = group.create_group(key)
+    sub["_type"] = "base64"
+    sub["value"] = b64encode(value).decode("utf8")
+
+
+def _decode_bytes(group: StorageGroup) -> bytes:
+    return b64decode(group["value"].encode("utf8"))
+
+
+_REDUCE_ITEMS = ("state", "listitems", "dictitems", "state_setter")
+
+
+def _save_reduce(
+    group,
+    func,
+    args,
+    *,
+    state=None,
+    listitems=None,
+    dictitems=None,
+    state_setter=None,
+):
+    group["_type"] = "pickle"
+    group["func"] = func
+    group["args"] = args
+    group["state"] = state
+    group["listitems"] = listitems
+    group["dictitems"] = dictitems
+    group["state_setter"] = state_setter
+
+
+def _encode_reduce(group: StorageGroup, key: str, value: Any) -> None:
+    reduce = getattr(value, "__reduce_ex__", None)
+    if reduce is None:
+        reduce = getattr(value, "__reduce__", None)
+    if reduce is None:
+        raise TypeError(f"Can not store {type(value)}")
+
+    rv = reduce(4)
+    sub = group.create_group(key)
+    if isinstance(rv, str):
+        sub["_type"] = "global"
+        sub["_class"] = group._join(value.__module__, rv)
+        return
+    func, args, *items = rv
+    _save_reduce(sub, func, args, **dict(zip(_REDUCE_ITEMS, items, strict=False)))
+
+
+def _decode_reduce(group: StorageGroup) -> Any:
+    func = group["func"]
+    args = group["args"]
+    obj = func(*args)
+    state = group["state"]
+    if hasattr(obj, "__setstate__"):
+        obj.__setstate__(state)
+    else:
+        obj.__dict__.update(**state)
+    if group["listitems"] is not None:
+        raise RuntimeError("listitems")
+    if group["dictitems"] is not None:
+        raise RuntimeError("dictitems")
+    return obj
+
+
+def _has_default_reduce(cls: type) -> bool:
+    return (
+        cls.__reduce_ex__ is object.__reduce_ex__
+        and cls.__reduce__ is object.__reduce__
+        and getattr(cls, "__getstate__", None) is getattr(object, "__getstate__", None)
+        and not hasattr(cls, "__setstate__")
+    )
+
+
+class CodecRegistry:
+    """
+    Compiles and caches how values of each type are stored in storage groups.
+
+    For every concrete type the encoder is chosen once, on first use, and reused
+    for all further values of the type. Tags written to the `_type` entry of a
+    group select the decoder on reading. Custom encoders and decoders for a type
+    and its subclasses can be registered with :meth:`register`.
+
+    Dataclasses without custom pickling are stored by their fields under the tag
+    "dataclass" and recreated without calling their `__init__`, like pickle does.
+    Instances holding attributes other than their fields, e.g. set in
+    `__post_init__`, are stored like any other object.
+    """
+
+    def __init__(self) -> None:
+        self._custom: dict[type, tuple[str, Encoder]] = {}
+        self._is_custom: dict[type, bool] = {}
+        self._encoders: dict[type, Encoder] = {}
+        self._dataclasses: set[type] = set()
+        self._fields: dict[type, tuple[str, ...]] = {}
+        self._decoders: dict[str, Decoder] = {
+            "type": _recreate_class,
+            "global": _recreate_class,
+            "pickle": _decode_reduce,
+            "tuple": _decode_tuple,
+            "base64": _decode_bytes,
+            "dataclass": self._decode_dataclass,
+        }
+
+    def register(
+        self,
+        cls: type,
+        tag: str,
+        encode: Callable[[StorageGroup, Any], None],
+        decode: Decoder,
+    ) -> None:
+        """
+        Register how values of a type and its subclasses are stored.
+
+        Args:
+            cls (type): The type.
+            tag (str): Identifies the decoder, stored in the `_type` entry.
+            encode (Callable[[StorageGroup, Any], None]): Fills an empty group
+                with a value.
+            decode (Decoder): Recreates the value from the group.
+        """
+
+        def encoder(group: StorageGroup, key: str, value: Any) -> None:
+            sub = group.create_group(key)
+            sub["_type"] = tag
+            encode(sub, value)
+
+        self._custom[cls] = (tag, encoder)
+        self._decoders[tag] = decode
+        self._encoders.clear()
+        self._dataclasses.clear()
+        self._is_custom.clear()
+
+    def is_custom(self, cls: type) -> bool:
+        """Whether a custom encoder is registered for the type or a base class."""
+        try:
+            return self._is_custom[cls]
+        except KeyError:
+            is_custom = any(base in self._custom for base in cls.__mro__)
+            self._is_custom[cls] = is_custom
+            return is_custom
+
+    def is_custom_tag(self, tag: Any) -> bool:
+        """Whether the tag belongs to a custom encoder."""
+        return any(tag == custom_tag for custom_tag, _ in self._custom.values())
+
+    def is_dataclass(self, cls: type) -> bool:
+        """Whether values of the type are stored by their dataclass fields."""
+        self.encoder(cls)
+        return cls in self._dataclasses
+
+    def encoder(self, cls: type) -> Encoder:
+        """The cached encoder of the type."""
+        try:
+            return self._encoders[cls]
+        except KeyError:
+            encoder = self._compile(cls)
+            self._encoders[cls] = encoder
+            return encoder
+
+    def decoder(self, tag: str) -> Decoder:
+        """
+        The decoder of the tag.
+
+        Args:
+            tag (str): The tag stored in the `_type` entry of a group.
+
+        Returns:
+            Decoder: The decoder.
+
+        Raises:
+            TypeError: If no decoder is known for the tag.
+        """
+        try:
+            return self._decoders[tag]
+        except KeyError:
+            raise TypeError(f"Could not instantiate: {tag}") from None
+
+    def _compile(self, cls: type) -> Encoder:
+        for base in cls.__mro__:
+            if base in self._custom:
+                return self._custom[base][1]
+        if issubclass(cls, type) or any("__call__" in vars(b) for b in cls.__mro__):
+            return _encode_type
+        if issubclass(cls, tuple):
+            return _encode_tuple
+        if issubclass(cls, dict):
+            return _encode_dict
+        if issubclass(cls, bytes):
+            return _encode_bytes
+        if dataclasses.is_dataclass(cls) and _has_default_reduce(cls):
+            self._dataclasses.add(cls)
+            return self._dataclass_encoder(cls)
+        return _encode_reduce
+
+    def field_names(self, cls: type) -> tuple[str, ...]:
+        """The cached field names of a dataclass."""
+        try:
+            return self._fields[cls]
+        except KeyError:
+            names = tuple(field.name for field in dataclasses.fields(cls))
+            self._fields[cls] = names
+            return names
+
+    def fields_only(self, value: Any) -> bool:
+        """Whether the attributes of a dataclass instance are exactly its fields."""
+        state = getattr(value, "__dict__", None)
+        return state is None or state.keys() == set(self.field_names(value.__class__))
+
+    def _dataclass_encoder(self, cls: type) -> Encoder:
+        names = self.field_names(cls)
+
+        def encoder(group: StorageGroup, key: str, value: Any) -> None:
+            if not self.fields_only(value):
+                _encode_reduce(group, key, value)
+                return
+            sub = group.create_group(key)
+            sub["_type"] = "dataclass"
+            sub["_class"] = group._join(cls.__module__, cls.__qualname__)
+            unwrap_dataclass(sub, value, names)
+
+        return encoder
+
+    def _decode_dataclass(self, group: StorageGroup) -> Any:
+        cls = _recreate_class(group)
+        obj = cls.__new__(cls)
+        for name in self.field_names(cls):
+            if name in group:
+                object.__setattr__(obj, name, group[name])
+        return obj
+
+
+codec_registry = CodecRegistry()
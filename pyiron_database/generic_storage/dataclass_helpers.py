@@ -1,15 +1,22 @@
 from __future__ import annotations
 
+from collections.abc import Iterable
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
     from _typeshed import DataclassInstance
 
-from dataclasses import fields
+    from pyiron_database.generic_storage.interface import StorageGroup
 
-from pyiron_database.generic_storage.interface import StorageGroup
+from dataclasses import fields
 
 
-def unwrap_dataclass(storage_group: StorageGroup, dataclass: DataclassInstance) -> None:
-    for field in fields(dataclass):
-        storage_group[field.name] = getattr(dataclass, field.name)
+def unwrap_dataclass(
+    storage_group: StorageGroup,
+    dataclass: DataclassInstance,
+    field_names: Iterable[str] | None = None,
+) -> None:
+    if field_names is None:
+        field_names = [field.name for field in fields(dataclass)]
+    for name in field_names:
+        storage_group[name] = getattr(dataclass, name)
@@ -1,29 +1,275 @@
 from __future__ import annotations
 
 import contextlib
-from collections.abc import Iterator
+import itertools
+import math
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass, field, replace
 from pathlib import Path
 from types import TracebackType
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 import h5py
+import numpy as np
 
 from pyiron_database.generic_storage.interface import StorageGroup
+from pyiron_database.obj_reconstruction.util import recreate_type
+
+if TYPE_CHECKING:
+    from pyiron_database.generic_storage.codecs import CodecRegistry
+
+
+def _homogeneous_array(value: list | tuple) -> np.ndarray | None:
+    """Convert a flat list of bools, ints, floats, complex numbers or strings.
+
+    Returns None if the items are of different types or of any other type.
+    """
+    item_types = {type(v) for v in value}
+    if len(item_types) > 1:
+        return None
+    item_type = item_types.pop() if item_types else float
+    if item_type is str:
+        return np.array(value, dtype=h5py.string_dtype())
+    if item_type not in (bool, int, float, complex):
+        return None
+    try:
+        return np.array(value, dtype=item_type)
+    except OverflowError:
+        return None
+
+
+# dense attribute storage (HDF5 >= 1.8), compact storage slows down quadratically
+# with the number of attributes of a group
+LIBVER = ("v108", "latest")
+_MAX_ATTRIBUTE_STRING = 1024
+_INT64_RANGE = range(-(2**63), 2**63)
+
+
+def _is_small_scalar(value: Any) -> bool:
+    """Whether the value is stored as an attribute instead of a dataset."""
+    if isinstance(value, str):
+        return len(value) <= _MAX_ATTRIBUTE_STRING and "\x00" not in value
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value in _INT64_RANGE
+    return isinstance(value, bool | float | complex) or (
+        isinstance(value, np.generic) and value.dtype.kind in "biufc"
+    )
+
+
+def _read_list(dataset: h5py.Dataset) -> list:
+    if h5py.check_string_dtype(dataset.dtype):
+        return dataset.asstr()[()].tolist()
+    return dataset[()].tolist()
+
+
+def _valid_column_name(name: Any) -> bool:
+    return isinstance(name, str) and bool(name) and name[0] != "_" and "/" not in name
+
+
+def _record_columns(
+    value: list, codecs: CodecRegistry
+) -> tuple[type | None, dict[str, np.ndarray]] | None:
+    """Split a list of dataclasses of one type or of dicts with equal keys.
+
+    Returns the dataclass, or None for dicts, and one array per field. Returns
+    None if the list holds anything else or a field is not a homogeneous scalar.
+    """
+    first = value[0]
+    cls = first.__class__
+    get: Callable[[Any, str], Any]
+    if cls is dict:
+        names: tuple[str, ...] = tuple(first)
+        keys = first.keys()
+        if not all(item.__class__ is dict and item.keys() == keys for item in value):
+            return None
+        get = dict.__getitem__
+    elif codecs.is_dataclass(cls):
+        names = codecs.field_names(cls)
+        if not all(
+            item.__class__ is cls and codecs.fields_only(item) for item in value
+        ):
+            return None
+        get = getattr
+    else:
+        return None
+    if not all(_valid_column_name(name) for name in names):
+        return None
+
+    columns = {}
+    for name in names:
+        array = _homogeneous_array([get(item, name) for item in value])
+        if array is None:
+            return None
+        columns[name] = array
+    return (None if cls is dict else cls), columns
+
+
+@dataclass(frozen=True)
+class HDF5StoragePolicy:
+    """
+    How arrays are laid out and compressed in HDF5 files.
+
+    Arrays smaller than min_size bytes are always written contiguously and
+    uncompressed. Larger arrays are chunked along their first axis into chunks of
+    about chunk_size bytes and passed through the configured filters.
+
+    Attributes:
+        compression (str | None): The compression filter, e.g. "gzip" or "lzf".
+        compression_opts (int | None): Options of the compression filter, e.g. the
+            gzip level.
+        shuffle (bool): Whether to apply the byte shuffle filter before
+            compression.
+        min_size (int): Arrays below this size in bytes stay contiguous.
+        chunk_size (int): The target size of a chunk in bytes.
+        outputs (dict[str, HDF5StoragePolicy]): Policies which replace this one
+            for the given top level keys, e.g. output names.
+    """
+
+    compression: str | None = None
+    compression_opts: int | None = None
+    shuffle: bool = False
+    min_size: int = 64 * 1024
+    chunk_size: int = 1024 * 1024
+    outputs: dict[str, HDF5StoragePolicy] = field(default_factory=dict)
+
+    def for_key(self, key: str) -> HDF5StoragePolicy:
+        """The policy for the values stored below the given key."""
+        policy = self.outputs.get(key, self)
+        return replace(policy, outputs={}) if policy.outputs else policy
+
+    def dataset_kwargs(self, array: np.ndarray) -> dict[str, Any]:
+        """The arguments of h5py.Group.create_dataset for the given array."""
+        filtered = self.compression is not None or self.shuffle
+        if not filtered or array.ndim == 0 or array.nbytes < self.min_size:
+            return {}
+        row_size = array.dtype.itemsize * math.prod(array.shape[1:])
+        rows = max(1, min(array.shape[0], self.chunk_size // max(row_size, 1)))
+        return {
+            "chunks": (rows, *array.shape[1:]),
+            "compression": self.compression,
+            "compression_opts": self.compression_opts,
+            "shuffle": self.shuffle,
+        }
+
+
+class LazyDataset:
+    """
+    A read-only view of an HDF5 dataset that reads only the requested slices.
+
+    The file is reopened on every access, so the view outlives the storage it
+    was read from.
+
+    Args:
+        filename (str): The HDF5 file containing the dataset.
+        name (str): The path of the dataset within the file.
+        shape (tuple[int, ...]): The shape of the dataset.
+        dtype (np.dtype): The data type of the dataset.
+    """
+
+    def __init__(
+        self, filename: str, name: str, shape: tuple[int, ...], dtype: np.dtype
+    ) -> None:
+        self.filename = filename
+        self.name = name
+        self.shape = shape
+        self.dtype = dtype
+
+    @property
+    def ndim(self) -> int:
+        return len(self.shape)
+
+    @property
+    def size(self) -> int:
+        return math.prod(self.shape)
+
+    def __len__(self) -> int:
+        return self.shape[0]
+
+    def __getitem__(self, key: Any) -> Any:
+        with h5py.File(self.filename, "r") as file:
+            return file[self.name][key]
+
+    def __array__(
+        self, dtype: np.dtype | None = None, copy: bool | None = None
+    ) -> np.ndarray:
+        array = self[()]
+        return array if dtype is None else array.astype(dtype, copy=False)
+
+    def __repr__(self) -> str:
+        return (
+            f"{type(self).__name__}({self.filename!r}, {self.name!r}, "
+            f"shape={self.shape}, dtype={self.dtype})"
+        )
+
+
+def _lazy_array(dataset: h5py.Dataset) -> np.ndarray | LazyDataset:
+    """Memory map contiguous, unfiltered datasets and wrap all others lazily."""
+    if dataset.size == 0:
+        return dataset[()]
+    filename = dataset.file.filename
+    offset = dataset.id.get_offset()
+    if dataset.chunks is None and offset is not None:
+        return np.memmap(
+            filename, dtype=dataset.dtype, mode="r", offset=offset, shape=dataset.shape
+        )
+    return LazyDataset(filename, dataset.name, dataset.shape, dataset.dtype)
+
+
+def set_default_policy(policy: HDF5StoragePolicy) -> None:
+    """Set the policy used by all HDF5 storages that are not given one."""
+    HDF5Group.default_policy = policy
 
 
 class HDF5Group(StorageGroup):
-    def __init__(self, data: h5py.File | h5py.Group) -> None:
+    """
+    A storage group in an HDF5 file.
+
+    Type tags, None, small scalars, and types or functions are stored as
+    attributes of the group, everything else as datasets and subgroups. Types
+    are stored as opaque class paths so they cannot be confused with strings.
+    Files which store all of them as datasets and subgroups can still be read.
+    """
+
+    default_policy: HDF5StoragePolicy = HDF5StoragePolicy()
+
+    def __init__(
+        self,
+        data: h5py.File | h5py.Group,
+        policy: HDF5StoragePolicy | None = None,
+        lazy: bool = False,
+    ) -> None:
         self.data = data
+        self.policy = self.default_policy if policy is None else policy
+        self.lazy = lazy
+
+    def _create_dataset(self, key: str, array: np.ndarray) -> h5py.Dataset:
+        return self.data.create_dataset(
+            key, data=array, **self.policy.for_key(key).dataset_kwargs(array)
+        )
 
     def __contains__(self, item: object) -> bool:
-        return item in self.data
+        return item in self.data.attrs or item in self.data
 
     def __delitem__(self, key: str) -> None:
-        del self.data[key]
+        if key in self.data.attrs:
+            del self.data.attrs[key]
+        else:
+            del self.data[key]
 
     def __getitem__(self, key: str) -> Any:
+        if key in self.data.attrs:
+            value = self.data.attrs[key]
+            if isinstance(value, h5py.Empty):
+                return None
+            if isinstance(value, np.void):
+                module, qualname, version = (
+                    value.tobytes().decode().split(self.separator)
+                )
+                return recreate_type(module, qualname, version)
+            return value
+
         if self.is_group(key):
-            group = HDF5Group(self.data[key])
+            group = HDF5Group(self.data[key], self.policy.for_key(key), self.lazy)
             type = group.get("_type", "group")
             match type:
                 case "group":
@@ -37,11 +283,19 @@ class HDF5Group(StorageGroup):
                         lst.append(group[f"item_{i}"])
                         i += 1
                     return lst
+                case "columns":
+                    return group._read_columns()
                 case _:
                     return self._recover_value(group)
 
         value = self.data[key]
 
+        # list or tuple stored as a single dataset
+        container_type = value.attrs.get("_type", None)
+        if container_type in ("list", "tuple"):
+            items = _read_list(value)
+            return items if container_type == "list" else tuple(items)
+
         # scalar
         if value.ndim == 0:
             if h5py.check_string_dtype(value.dtype):
@@ -49,56 +303,138 @@ class HDF5Group(StorageGroup):
             return value[()]
 
         # array
+        if self.lazy and value.dtype.kind in "biufc":
+            return _lazy_array(value)
         return value[:]
 
     def __setitem__(self, key: str, value: Any) -> None:
         if value is None:
-            group = self.create_group(key)
-            group["_type"] = "None"
+            self.data.attrs[key] = h5py.Empty("i1")
+            return
+
+        if self.codecs.is_custom(value.__class__):
+            self._transform_value(key, value)
+            return
+
+        if _is_small_scalar(value):
+            self.data.attrs[key] = value
+            return
+
+        if isinstance(value, type) or callable(value):
+            self.data.attrs[key] = np.void(self._class_path(value).encode())
+            return
+
+        if isinstance(value, list | tuple):
+            array = _homogeneous_array(value)
+            if array is not None:
+                dataset = self._create_dataset(key, array)
+                dataset.attrs["_type"] = type(value).__name__
+                return
+
+        if isinstance(value, tuple):
+            self._transform_value(key, value)
             return
 
         if isinstance(value, list):
+            records = _record_columns(value, self.codecs) if value else None
+            if records is not None:
+                self._write_columns(key, len(value), *records)
+                return
+
             group = self.create_group(key)
             group["_type"] = "list"
             for i, v in enumerate(value):
                 group[f"item_{i}"] = v
             return
 
+        if isinstance(value, np.ndarray) and value.dtype.kind in "biufc":
+            self._create_dataset(key, value)
+            return
+
+        if self.codecs.is_dataclass(value.__class__):
+            self._transform_value(key, value)
+            return
+
         try:
             self.data[key] = value
         except TypeError:
             self._transform_value(key, value)
 
+    def _write_columns(
+        self, key: str, length: int, cls: type | None, columns: dict[str, np.ndarray]
+    ) -> None:
+        group = self.create_group(key)
+        group["_type"] = "columns"
+        if cls is not None:
+            group["_class"] = self._join(cls.__module__, cls.__qualname__)
+        group.data.attrs["_length"] = length
+        group.data.attrs["_columns"] = np.array(
+            list(columns), dtype=h5py.string_dtype()
+        )
+        for name, array in columns.items():
+            group._create_dataset(name, array)
+
+    def _read_columns(self) -> list:
+        names = self.data.attrs["_columns"].tolist()
+        columns = [_read_list(self.data[name]) for name in names]
+        rows = (
+            zip(*columns, strict=True) if columns else [()] * self.data.attrs["_length"]
+        )
+        if "_class" not in self:
+            return [dict(zip(names, row, strict=True)) for row in rows]
+
+        module, qualname, version = self["_class"].split(self.separator)
+        cls = recreate_type(module, qualname, version)
+        records = []
+        for row in rows:
+            obj = cls.__new__(cls)
+            for name, v in zip(names, row, strict=True):
+                object.__setattr__(obj, name, v)
+            records.append(obj)
+        return records
+
     def __iter__(self) -> Iterator[str]:
-        return iter(self.data)
+        return itertools.chain(self.data.attrs, self.data)
 
     def __len__(self) -> int:
-        return len(self.data)
+        return len(self.data.attrs) + len(self.data)
 
     def create_group(self, key: str) -> HDF5Group:
-        return HDF5Group(self.data.create_group(key))
+        return HDF5Group(
+            self.data.create_group(key), self.policy.for_key(key), self.lazy
+        )
 
     def require_group(self, key: str) -> HDF5Group:
-        return HDF5Group(self.data.require_group(key))
+        return HDF5Group(
+            self.data.require_group(key), self.policy.for_key(key), self.lazy
+        )
 
     def is_group(self, key: str) -> bool:
         return self.data.get(key, getclass=True) is h5py.Group
 
 
 class HDF5Storage(contextlib.AbstractContextManager[HDF5Group]):
-    def __init__(self, filename: str, mode: str = "r") -> None:
+    def __init__(
+        self,
+        filename: str,
+        mode: str = "r",
+        policy: HDF5StoragePolicy | None = None,
+        lazy: bool = False,
+    ) -> None:
         super().__init__()
+        self.policy = policy
+        self.lazy = lazy
         self.filename = Path(filename)
         path = self.filename.parent
         path.mkdir(parents=True, exist_ok=True)
-        self.file = h5py.File(filename, mode)
+        self.file = h5py.File(filename, mode, libver=LIBVER)
         self.data = self.file
 
     def _close(self) -> None:
         self.file.close()
 
     def __enter__(self) -> HDF5Group:
-        return HDF5Group(self.data)
+        return HDF5Group(self.data, self.policy, self.lazy)
 
     def __exit__(
         self,
@@ -0,0 +1,196 @@
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import struct
+import tempfile
+from collections.abc import Callable, Iterator, MutableMapping
+from pathlib import Path
+from typing import Any
+
+MAGIC = b"PYIRIDX1"
+FOOTER = struct.Struct(f"<QQ{len(MAGIC)}s")
+
+
+def is_indexed_file(filename: str | Path) -> bool:
+    """Whether the file exists and is in the indexed format."""
+    try:
+        with open(filename, "rb") as file:
+            return file.read(len(MAGIC)) == MAGIC
+    except FileNotFoundError:
+        return False
+
+
+class IndexedFile(MutableMapping[str, Any]):
+    """
+    The top level values of a storage file, each serialized on its own.
+
+    The file starts with a magic number, followed by the serialized values and
+    an index from key to byte range, which is located by a fixed size footer.
+    Values are deserialized when they are first accessed. On :meth:`close`
+    values which were set or changed are appended together with a new index, so
+    untouched values are neither read nor written again. Once the superseded
+    and deleted values take up more space than the live ones, the file is
+    rewritten with only the live values instead, see :meth:`compact`.
+
+    Args:
+        filename (str | Path): The file.
+        mode (str): "r" to read, "w" to create a new file and "a" to update an
+            existing file or create it.
+        dumps (Callable[[Any], bytes]): Serializes a single value.
+        loads (Callable[[bytes], Any]): Deserializes a single value.
+    """
+
+    def __init__(
+        self,
+        filename: str | Path,
+        mode: str,
+        dumps: Callable[[Any], bytes],
+        loads: Callable[[bytes], Any],
+    ) -> None:
+        self.dumps = dumps
+        self.loads = loads
+        self.filename = Path(filename)
+        self.writable = mode != "r"
+        if mode == "a" and not self.filename.exists():
+            mode = "w"
+        self.file = open(self.filename, {"r": "rb", "w": "w+b", "a": "r+b"}[mode])  # noqa: SIM115
+        self.index: dict[str, tuple[int, int]] = {}
+        self._values: dict[str, Any] = {}
+        self._raw: dict[str, bytes] = {}
+        self._changed = False
+        if mode == "w":
+            self.file.write(MAGIC)
+            self._changed = True
+        else:
+            self._read_index()
+
+    def _read_index(self) -> None:
+        if self.file.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{self.file.name} is not an indexed file")
+        self.file.seek(-FOOTER.size, 2)
+        offset, length, magic = FOOTER.unpack(self.file.read(FOOTER.size))
+        if magic != MAGIC:
+            raise ValueError(f"{self.file.name} has no valid index")
+        self.file.seek(offset)
+        self.index = {
+            key: (start, size)
+            for key, (start, size) in json.loads(self.file.read(length)).items()
+        }
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._values:
+            return self._values[key]
+        start, size = self.index[key]
+        self.file.seek(start)
+        raw = self.file.read(size)
+        value = self.loads(raw)
+        self._values[key] = value
+        if self.writable:
+            # values can be changed in place, compare them on close
+            self._raw[key] = raw
+        return value
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self._values[key] = value
+        self._raw.pop(key, None)
+        self._changed = True
+
+    def __delitem__(self, key: str) -> None:
+        if key not in self:
+            raise KeyError(key)
+        self.index.pop(key, None)
+        self._values.pop(key, None)
+        self._raw.pop(key, None)
+        self._changed = True
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._values or key in self.index
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self.index
+        yield from (key for key in self._values if key not in self.index)
+
+    def __len__(self) -> int:
+        return len(self.index.keys() | self._values.keys())
+
+    def _updates(self) -> dict[str, bytes]:
+        updates = {}
+        for key, value in self._values.items():
+            raw = self.dumps(value)
+            if self._raw.get(key) != raw:
+                updates[key] = raw
+        return updates
+
+    def flush(self) -> None:
+        """Append changed values and a new index, or compact the file."""
+        if not self.writable:
+            return
+        updates = self._updates()
+        if not updates and not self._changed:
+            return
+        end = self.file.seek(0, 2)
+        kept = sum(size for key, (_, size) in self.index.items() if key not in updates)
+        live = kept + sum(len(raw) for raw in updates.values())
+        if end - len(MAGIC) - kept > live:
+            self._rewrite(updates)
+            return
+
+        for key, raw in updates.items():
+            self.index[key] = (self.file.tell(), len(raw))
+            self.file.write(raw)
+            self._raw[key] = raw
+        self._write_index(self.file, self.index)
+        self.file.flush()
+        self._changed = False
+
+    def compact(self) -> None:
+        """Rewrite the file with only the live values and the changes."""
+        if self.writable:
+            self._rewrite(self._updates())
+
+    @staticmethod
+    def _write_index(file: Any, index: dict[str, tuple[int, int]]) -> None:
+        raw = json.dumps(index).encode()
+        offset = file.tell()
+        file.write(raw)
+        file.write(FOOTER.pack(offset, len(raw), MAGIC))
+
+    def _rewrite(self, updates: dict[str, bytes]) -> None:
+        raws = {}
+        for key, (start, size) in self.index.items():
+            if key not in updates:
+                self.file.seek(start)
+                raws[key] = self.file.read(size)
+        raws.update(updates)
+        # write a new file next to the old one, so a failure leaves the old intact
+        fd, tmp = tempfile.mkstemp(dir=self.filename.parent, suffix=".tmp")
+        replaced = False
+        try:
+            with os.fdopen(fd, "wb") as file:
+                file.write(MAGIC)
+                index: dict[str, tuple[int, int]] = {}
+                for key, raw in raws.items():
+                    index[key] = (file.tell(), len(raw))
+                    file.write(raw)
+                self._write_index(file, index)
+            shutil.copymode(self.filename, tmp)
+            self.file.close()
+            os.replace(tmp, self.filename)
+            self.index = index
+            replaced = True
+        finally:
+            if not replaced:
+                Path(tmp).unlink()
+            if self.file.closed:
+                self.file = open(self.filename, "r+b")  # noqa: SIM115
+        self._raw.update(updates)
+        self._changed = False
+
+    def close(self) -> None:
+        """Flush the changes and close the file."""
+        try:
+            self.flush()
+        finally:
+            self.file.close()
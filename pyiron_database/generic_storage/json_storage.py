@@ -2,15 +2,17 @@ from __future__ import annotations
 
 import contextlib
 import json
+from collections.abc import MutableMapping
 from pathlib import Path
 from types import NoneType, TracebackType
 from typing import Any
 
+from pyiron_database.generic_storage.indexed_file import IndexedFile, is_indexed_file
 from pyiron_database.generic_storage.interface import StorageGroup
 
 
 class JSONGroup(StorageGroup):
-    def __init__(self, data: dict[str, Any]) -> None:
+    def __init__(self, data: MutableMapping[str, Any]) -> None:
         self.data = data
 
     def __contains__(self, item: object) -> bool:
@@ -32,7 +34,9 @@ class JSONGroup(StorageGroup):
         return self.data[key]
 
     def __setitem__(self, key: str, value: Any) -> None:
-        if isinstance(value, int | float | str | list | NoneType):
+        if isinstance(value, int | float | str | list | NoneType) and not (
+            self.codecs.is_custom(value.__class__)
+        ):
             self.data[key] = value
             return
 
@@ -61,15 +65,39 @@ class JSONGroup(StorageGroup):
 
 
 class JSONStorage(contextlib.AbstractContextManager[JSONGroup]):
-    def __init__(self, filename: str, mode: str = "r") -> None:
+    """
+    A JSON file holding a dict.
+
+    In indexed mode every top level value is serialized on its own, see
+    :class:`IndexedFile`, so single keys are loaded on access and updated in
+    mode "a" without rewriting the rest of the file. Indexed files are detected
+    when reading.
+
+    Args:
+        filename (str): The JSON file.
+        mode (str): "r" to read, "w" to write and, for indexed files, "a" to
+            update.
+        indexed (bool): Whether to write the indexed format.
+    """
+
+    def __init__(self, filename: str, mode: str = "r", indexed: bool = False) -> None:
         super().__init__()
         self.filename = Path(filename)
         self.mode = mode
-        self.data: dict[str, Any] = {}
+        self.indexed = indexed
+        self.data: MutableMapping[str, Any] = {}
 
     def __enter__(self) -> JSONGroup:
         path = self.filename.parent
         path.mkdir(parents=True, exist_ok=True)
+        if (
+            self.indexed
+            or self.mode == "a"
+            or (self.mode == "r" and is_indexed_file(self.filename))
+        ):
+            self.data = IndexedFile(self.filename, self.mode, _dumps, json.loads)
+            return JSONGroup(self.data)
+
         with open(self.filename, self.mode) as file:
             if file.readable():
                 self.data = json.loads(file.read())
@@ -82,6 +110,14 @@ class JSONStorage(contextlib.AbstractContextManager[JSONGroup]):
         exc_value: BaseException | None,
         traceback: TracebackType | None,
     ) -> None:
+        if isinstance(self.data, IndexedFile):
+            self.data.close()
+            return
+
         with open(self.filename, self.mode) as file:
             if file.writable():
                 file.write(json.dumps(self.data))
+
+
+def _dumps(value: Any) -> bytes:
+    return json.dumps(value).encode()
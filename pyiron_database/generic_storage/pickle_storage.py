@@ -1,16 +1,20 @@
 from __future__ import annotations
 
 import contextlib
+import mmap
 import pickle
+from collections.abc import MutableMapping
+from functools import partial
 from pathlib import Path
 from types import TracebackType
 from typing import Any
 
+from pyiron_database.generic_storage.indexed_file import IndexedFile, is_indexed_file
 from pyiron_database.generic_storage.interface import StorageGroup
 
 
 class PickleGroup(StorageGroup):
-    def __init__(self, data: dict[str, Any]) -> None:
+    def __init__(self, data: MutableMapping[str, Any]) -> None:
         self.data = data
 
     def __contains__(self, item: object) -> bool:
@@ -20,9 +24,15 @@ class PickleGroup(StorageGroup):
         del self.data[key]
 
     def __getitem__(self, key: str) -> Any:
-        return self.data[key]
+        value = self.data[key]
+        if isinstance(value, dict) and self.codecs.is_custom_tag(value.get("_type")):
+            return self._recover_value(PickleGroup(value))
+        return value
 
     def __setitem__(self, key: str, value: Any) -> None:
+        if self.codecs.is_custom(value.__class__):
+            self._transform_value(key, value)
+            return
         self.data[key] = value
 
     def __iter__(self):
@@ -44,19 +54,78 @@ class PickleGroup(StorageGroup):
         return isinstance(self.get(key, None), dict)
 
 
+OUT_OF_BAND = "pyiron_database.out_of_band"
+ALIGNMENT = 64
+
+
 class PickleStorage(contextlib.AbstractContextManager[PickleGroup]):
-    def __init__(self, filename: str, mode="rb") -> None:
+    """
+    A pickle file holding a dict.
+
+    In out-of-band mode, buffers of at least min_buffer_size bytes, e.g. the data
+    of numpy arrays, are written with pickle protocol 5 into a side file next to
+    the pickle file, each aligned to 64 bytes. On loading they are memory mapped
+    instead of copied through the pickle stream, so the restored arrays are
+    read-only views of the side file.
+
+    In indexed mode every top level value is pickled on its own, see
+    :class:`IndexedFile`, so single keys are loaded on access and updated in
+    mode "ab" without rewriting the rest of the file. Indexed files keep their
+    buffers in band.
+
+    Files of any mode are read without further arguments.
+
+    Args:
+        filename (str): The pickle file.
+        mode (str): "rb" to read, "wb" to write and, for indexed files, "ab" to
+            update.
+        out_of_band (bool): Whether to write large buffers to the side file.
+        min_buffer_size (int): The size in bytes from which buffers are written
+            out of band.
+        indexed (bool): Whether to write the indexed format.
+
+    Raises:
+        ValueError: If both out_of_band and indexed are requested.
+    """
+
+    def __init__(
+        self,
+        filename: str,
+        mode: str = "rb",
+        out_of_band: bool = False,
+        min_buffer_size: int = 64 * 1024,
+        indexed: bool = False,
+    ) -> None:
         super().__init__()
+        if out_of_band and indexed:
+            raise ValueError("Indexed pickle files can not store buffers out of band")
         self.filename = Path(filename)
+        self.buffer_filename = self.filename.with_name(self.filename.name + ".buffers")
         self.mode = mode
-        self.data: dict = {}
+        self.out_of_band = out_of_band
+        self.min_buffer_size = min_buffer_size
+        self.indexed = indexed
+        self.data: MutableMapping[str, Any] = {}
 
     def __enter__(self) -> PickleGroup:
         path = self.filename.parent
         path.mkdir(parents=True, exist_ok=True)
+        if (
+            self.indexed
+            or "a" in self.mode
+            or ("r" in self.mode and is_indexed_file(self.filename))
+        ):
+            self.data = IndexedFile(
+                self.filename,
+                self.mode.rstrip("b"),
+                partial(pickle.dumps, protocol=pickle.HIGHEST_PROTOCOL),
+                pickle.loads,
+            )
+            return PickleGroup(self.data)
+
         with open(self.filename, self.mode) as file:
             if file.readable():
-                self.data = pickle.load(file)
+                self.data = self._load(file)
 
         return PickleGroup(self.data)
 
@@ -66,6 +135,55 @@ class PickleStorage(contextlib.AbstractContextManager[PickleGroup]):
         exc_value: BaseException | None,
         traceback: TracebackType | None,
     ) -> None:
+        if isinstance(self.data, IndexedFile):
+            self.data.close()
+            return
+
         with open(self.filename, self.mode) as file:
             if file.writable():
-                pickle.dump(self.data, file, pickle.HIGHEST_PROTOCOL)
+                self._dump(file)
+
+    def _load(self, file) -> dict:
+        header = pickle.load(file)
+        if not (isinstance(header, tuple) and header[0] == OUT_OF_BAND):
+            return header
+
+        table = header[1]
+        if not table:
+            return pickle.load(file)
+        with open(self.buffer_filename, "rb") as buffer_file:
+            mapped = mmap.mmap(buffer_file.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(mapped)
+        buffers = [view[offset : offset + size] for offset, size in table]
+        return pickle.load(file, buffers=buffers)
+
+    def _dump(self, file) -> None:
+        self.buffer_filename.unlink(missing_ok=True)
+        if not self.out_of_band:
+            pickle.dump(self.data, file, pickle.HIGHEST_PROTOCOL)
+            return
+
+        buffers: list[memoryview] = []
+
+        def buffer_callback(buffer: pickle.PickleBuffer) -> bool:
+            try:
+                raw = buffer.raw()
+            except BufferError:
+                return True
+            if raw.nbytes < self.min_buffer_size:
+                return True
+            buffers.append(raw)
+            return False
+
+        stream = pickle.dumps(self.data, 5, buffer_callback=buffer_callback)
+        table = []
+        if buffers:
+            with open(self.buffer_filename, "wb") as buffer_file:
+                for raw in buffers:
+                    offset = buffer_file.tell()
+                    padding = -offset % ALIGNMENT
+                    buffer_file.write(bytes(padding))
+                    table.append((offset + padding, raw.nbytes))
+                    buffer_file.write(raw)
+        pickle.dump((OUT_OF_BAND, table), file, pickle.HIGHEST_PROTOCOL)
+        file.write(stream)
@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import abc
+
+from .InstanceDatabase import InstanceDatabase, connected_hashes
+
+
+class AsyncInstanceDatabase(abc.ABC):
+    """The asyncio counterpart of :class:`InstanceDatabase`."""
+
+    NodeData = InstanceDatabase.NodeData
+
+    @abc.abstractmethod
+    async def init(self) -> None:
+        """Initialize what this database backend needs.
+
+        It is possible to call this function multiple times.
+        If called multiple times it will skip the initialization.
+        """
+        pass
+
+    @abc.abstractmethod
+    async def drop(self) -> None:
+        """Drop anything related to this database backend.
+
+        Can be called mutiple times.
+        """
+        pass
+
+    @abc.abstractmethod
+    async def close(self) -> None:
+        """Release all connections of this database backend."""
+        pass
+
+    @abc.abstractmethod
+    async def create(self, node: InstanceDatabase.NodeData) -> str:
+        """
+        Create a new entry in the database.
+
+        Args:
+            node (InstanceDatabase.NodeData): The data of the node to be created in the database.
+
+        Returns:
+            str: The hash of the newly created node.
+        """
+        pass
+
+    @abc.abstractmethod
+    async def create_many(self, nodes: list[InstanceDatabase.NodeData]) -> list[str]:
+        """
+        Create many new entries in the database at once.
+
+        See :meth:`InstanceDatabase.create_many`.
+
+        Args:
+            nodes (list[InstanceDatabase.NodeData]): The data of the nodes to be created.
+
+        Returns:
+            list[str]: The hashes of the given nodes.
+        """
+        pass
+
+    @abc.abstractmethod
+    async def read(self, hash: str) -> InstanceDatabase.NodeData | None:
+        """
+        Read the node data from the database.
+
+        Args:
+            hash (str): The hash of the node to be read.
+
+        Returns:
+            InstanceDatabase.NodeData | None: The node data if the node exists, otherwise None.
+        """
+        pass
+
+    @abc.abstractmethod
+    async def read_many(
+        self, hashes: list[str]
+    ) -> dict[str, InstanceDatabase.NodeData]:
+        """
+        Read the data of many nodes from the database at once.
+
+        Args:
+            hashes (list[str]): The hashes of the nodes to be read.
+
+        Returns:
+            dict[str, InstanceDatabase.NodeData]: The node data by hash. Hashes which are not in the
+                database are missing.
+        """
+        pass
+
+    async def read_ancestors(
+        self, hashes: list[str]
+    ) -> dict[str, InstanceDatabase.NodeData]:
+        """
+        Read the given nodes and all nodes connected to their inputs recursively.
+
+        See :meth:`InstanceDatabase.read_ancestors`.
+
+        Args:
+            hashes (list[str]): The hashes of the nodes to start from.
+
+        Returns:
+            dict[str, InstanceDatabase.NodeData]: The node data by hash. Hashes which are not in the
+                database are missing.
+        """
+        nodes: dict[str, InstanceDatabase.NodeData] = {}
+        requested = set(hashes)
+        frontier = set(hashes)
+        while frontier:
+            found = await self.read_many(list(frontier))
+            nodes.update(found)
+            frontier = connected_hashes(found.values()) - requested
+            requested |= frontier
+        return nodes
+
+    @abc.abstractmethod
+    async def update(self, hash: str, **kwargs) -> None:
+        """
+        Update a node in the database.
+
+        See :meth:`InstanceDatabase.update`.
+
+        Args:
+            hash (str): The hash of the node to be updated.
+            **kwargs: The key-value pairs to update the node with.
+        """
+        pass
+
+    @abc.abstractmethod
+    async def delete(self, hash: str) -> None:
+        """
+        Delete the node with the given hash from the database.
+
+        Args:
+            hash (str): The hash of the node to be deleted.
+        """
+        pass
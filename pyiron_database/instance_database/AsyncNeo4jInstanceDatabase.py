@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+from typing import Any
+
+try:
+    from neo4j import AsyncGraphDatabase
+
+    FAILED_IMPORT = None
+except ImportError as err:
+    FAILED_IMPORT = err.name
+
+from .AsyncInstanceDatabase import AsyncInstanceDatabase
+from .InstanceDatabase import InstanceDatabase
+from .Neo4jInstanceDatabase import (
+    CONSTRAINT_QUERY,
+    CREATE_QUERY,
+    DEDUPLICATE_QUERIES,
+    DELETE_QUERY,
+    DROP_QUERY,
+    INIT_QUERIES,
+    READ_QUERY,
+    UPDATE_QUERY,
+    node_parameters,
+    node_properties,
+    record_to_node_data,
+)
+
+
+class AsyncNeo4jInstanceDatabase(AsyncInstanceDatabase):
+    batch_size: int = 1000
+    """Maximum number of nodes per create statement in :meth:`create_many`."""
+
+    def __init__(self, uri: str, auth: tuple[str, str]) -> None:
+        if FAILED_IMPORT is not None:
+            raise ImportError(
+                f"{type(self)} requires '{FAILED_IMPORT}' to be installed."
+            )
+        self.uri = uri
+        self.auth = auth
+        self.driver = AsyncGraphDatabase.driver(self.uri, auth=self.auth)
+
+    async def close(self) -> None:
+        await self.driver.close()
+
+    async def init(self) -> None:
+        async with self.driver.session(database="neo4j") as session:
+            result = await session.run(CONSTRAINT_QUERY)
+            if await result.single() is None:
+                for query in DEDUPLICATE_QUERIES:
+                    await session.run(query)
+            for query in INIT_QUERIES:
+                await session.run(query)
+
+    async def drop(self) -> None:
+        async with self.driver.session(database="neo4j") as session:
+            await session.run(DROP_QUERY)
+
+    async def create(self, node: InstanceDatabase.NodeData) -> str:
+        return (await self.create_many([node]))[0]
+
+    async def create_many(self, nodes: list[InstanceDatabase.NodeData]) -> list[str]:
+        async def create_nodes(tx, parameters: list[dict]) -> None:
+            for start in range(0, len(parameters), self.batch_size):
+                await tx.run(
+                    CREATE_QUERY, nodes=parameters[start : start + self.batch_size]
+                )
+
+        async with self.driver.session(database="neo4j") as session:
+            await session.execute_write(create_nodes, parameters=node_parameters(nodes))
+        return [node.hash for node in nodes]
+
+    async def read(self, hash: str) -> InstanceDatabase.NodeData | None:
+        return (await self.read_many([hash])).get(hash)
+
+    async def read_many(
+        self, hashes: list[str]
+    ) -> dict[str, InstanceDatabase.NodeData]:
+        async def read_nodes(tx, hashes: list[str]) -> list[dict[str, Any]]:
+            return await (await tx.run(READ_QUERY, hashes=hashes)).data()
+
+        async with self.driver.session(database="neo4j") as session:
+            records = await session.execute_read(read_nodes, hashes=hashes)
+
+        nodes = (record_to_node_data(record) for record in records)
+        return {node.hash: node for node in nodes}
+
+    async def update(self, hash: str, **kwargs) -> None:
+        async with self.driver.session(database="neo4j") as session:
+            await session.run(
+                UPDATE_QUERY, hash=hash, properties=node_properties(kwargs)
+            )
+
+    async def delete(self, hash: str) -> None:
+        async with self.driver.session(database="neo4j") as session:
+            await session.run(DELETE_QUERY, hash=hash)
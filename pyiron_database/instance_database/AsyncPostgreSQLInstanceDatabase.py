@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+from dataclasses import asdict
+
+try:
+    from sqlalchemy import MetaData
+    from sqlalchemy.dialects.postgresql import insert
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    FAILED_IMPORT = None
+except ImportError as err:
+    FAILED_IMPORT = err.name
+
+
+from .AsyncInstanceDatabase import AsyncInstanceDatabase
+from .InstanceDatabase import InstanceDatabase
+from .PostgreSQLInstanceDatabase import node_table, read_ancestors_statement
+
+
+class AsyncPostgreSQLInstanceDatabase(AsyncInstanceDatabase):
+    batch_size: int = 1000
+    """Maximum number of rows per INSERT statement in :meth:`create_many`."""
+
+    def __init__(
+        self,
+        connection_string: str,
+        echo: bool = False,
+        *,
+        pool_size: int = 5,
+        max_overflow: int = 10,
+        pool_timeout: float = 30.0,
+        pool_recycle: int = -1,
+        pool_pre_ping: bool = False,
+    ) -> None:
+        if FAILED_IMPORT is not None:
+            raise ImportError(
+                f"{type(self)} requires '{FAILED_IMPORT}' to be installed."
+            )
+
+        self.metadata = MetaData()
+        self.table = node_table(self.metadata)
+
+        self.engine = create_async_engine(
+            connection_string,
+            echo=echo,
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            pool_timeout=pool_timeout,
+            pool_recycle=pool_recycle,
+            pool_pre_ping=pool_pre_ping,
+        )
+
+    async def init(self) -> None:
+        async with self.engine.begin() as connection:
+            await connection.run_sync(self.metadata.create_all)
+
+    async def drop(self) -> None:
+        async with self.engine.begin() as connection:
+            await connection.run_sync(self.metadata.drop_all)
+
+    async def close(self) -> None:
+        await self.engine.dispose()
+
+    async def create(self, node: InstanceDatabase.NodeData) -> str:
+        return (await self.create_many([node]))[0]
+
+    async def create_many(self, nodes: list[InstanceDatabase.NodeData]) -> list[str]:
+        unique_nodes = list({node.hash: node for node in nodes}.values())
+        async with self.engine.begin() as connection:
+            for start in range(0, len(unique_nodes), self.batch_size):
+                rows = [
+                    asdict(node)
+                    for node in unique_nodes[start : start + self.batch_size]
+                ]
+                stmt = insert(self.table).values(rows).on_conflict_do_nothing()
+                await connection.execute(stmt)
+        return [node.hash for node in nodes]
+
+    async def read(self, hash: str) -> InstanceDatabase.NodeData | None:
+        async with self.engine.connect() as connection:
+            stmt = self.table.select().where(self.table.c.hash == hash)
+            result = (await connection.execute(stmt)).first()
+            return None if result is None else self.NodeData(**result._mapping)
+
+    async def read_many(
+        self, hashes: list[str]
+    ) -> dict[str, InstanceDatabase.NodeData]:
+        nodes = {}
+        async with self.engine.connect() as connection:
+            for start in range(0, len(hashes), self.batch_size):
+                stmt = self.table.select().where(
+                    self.table.c.hash.in_(hashes[start : start + self.batch_size])
+                )
+                for row in await connection.execute(stmt):
+                    nodes[row.hash] = self.NodeData(**row._mapping)
+        return nodes
+
+    async def read_ancestors(
+        self, hashes: list[str]
+    ) -> dict[str, InstanceDatabase.NodeData]:
+        async with self.engine.connect() as connection:
+            rows = await connection.execute(
+                read_ancestors_statement(), {"hashes": hashes}
+            )
+            return {row.hash: self.NodeData(**row._mapping) for row in rows}
+
+    async def update(self, hash: str, **kwargs) -> None:
+        async with self.engine.begin() as connection:
+            stmt = self.table.update().where(self.table.c.hash == hash).values(**kwargs)
+            await connection.execute(stmt)
+
+    async def delete(self, hash: str) -> None:
+        async with self.engine.begin() as connection:
+            stmt = self.table.delete().where(self.table.c.hash == hash)
+            await connection.execute(stmt)
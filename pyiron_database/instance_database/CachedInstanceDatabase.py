@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from .InstanceDatabase import InstanceDatabase, connected_hashes
+
+
+class CachedInstanceDatabase(InstanceDatabase):
+    """
+    An in-process LRU cache in front of another instance database.
+
+    Node records are content addressed and, apart from their output path, do not
+    change after they are created, so reads are served from memory whenever
+    possible. Records without an output path are not cached, since another
+    client, e.g. a worker of :class:`CachingExecutor`, may still set it. The cache
+    is bounded by the number of records and by their approximate size. Misses can
+    be cached as well for negative_ttl seconds. Records are invalidated by update
+    and delete through this wrapper. Reads return copies, so changing a returned
+    record does not change the cache.
+
+    Args:
+        db (InstanceDatabase): The database to cache.
+        max_entries (int): The maximum number of cached records.
+        max_bytes (int | None): The maximum approximate size of all cached records
+            in bytes. None disables the limit.
+        negative_ttl (float): Seconds for which a miss is remembered. The default
+            0 disables caching of misses.
+    """
+
+    def __init__(
+        self,
+        db: InstanceDatabase,
+        max_entries: int = 10_000,
+        max_bytes: int | None = None,
+        negative_ttl: float = 0.0,
+    ) -> None:
+        self.db = db
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.negative_ttl = negative_ttl
+        self.hits = 0
+        self.misses = 0
+        self.nbytes = 0
+        self._records: OrderedDict[str, tuple[InstanceDatabase.NodeData, int]] = (
+            OrderedDict()
+        )
+        self._missing: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def hit_ratio(self) -> float:
+        """The fraction of reads which were served from memory."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def clear(self) -> None:
+        with self._lock:
+            self._records.clear()
+            self._missing.clear()
+            self.nbytes = 0
+
+    def init(self) -> None:
+        self.db.init()
+
+    def drop(self) -> None:
+        self.db.drop()
+        self.clear()
+
+    def create(self, node: InstanceDatabase.NodeData) -> str:
+        result = self.db.create(node)
+        with self._lock:
+            self._missing.pop(node.hash, None)
+        return result
+
+    def create_many(self, nodes: list[InstanceDatabase.NodeData]) -> list[str]:
+        result = self.db.create_many(nodes)
+        with self._lock:
+            for node in nodes:
+                self._missing.pop(node.hash, None)
+        return result
+
+    def read(self, hash: str) -> InstanceDatabase.NodeData | None:
+        return self.read_many([hash]).get(hash)
+
+    def read_many(self, hashes: list[str]) -> dict[str, InstanceDatabase.NodeData]:
+        nodes, uncached = self._lookup(hashes)
+        if uncached:
+            found = self.db.read_many(uncached)
+            self._store(uncached, found)
+            nodes.update(found)
+        return {hash: copy.deepcopy(node) for hash, node in nodes.items()}
+
+    def read_ancestors(self, hashes: list[str]) -> dict[str, InstanceDatabase.NodeData]:
+        nodes: dict[str, InstanceDatabase.NodeData] = {}
+        uncached: list[str] = []
+        frontier = list(hashes)
+        while frontier:
+            found, missing = self._lookup(frontier)
+            nodes.update(found)
+            uncached.extend(missing)
+            frontier = list(
+                connected_hashes(found.values()) - nodes.keys() - set(uncached)
+            )
+
+        # let the backend resolve everything below the cached part in one go
+        if uncached:
+            found = self.db.read_ancestors(uncached)
+            self._store(uncached, found)
+            nodes.update(found)
+        return {hash: copy.deepcopy(node) for hash, node in nodes.items()}
+
+    def update(self, hash: str, **kwargs) -> None:
+        self._invalidate(hash)
+        self.db.update(hash, **kwargs)
+        self._invalidate(hash)
+
+    def delete(self, hash: str) -> None:
+        self._invalidate(hash)
+        self.db.delete(hash)
+        self._invalidate(hash)
+
+    def _lookup(
+        self, hashes: list[str]
+    ) -> tuple[dict[str, InstanceDatabase.NodeData], list[str]]:
+        nodes = {}
+        uncached = []
+        now = time.monotonic()
+        with self._lock:
+            for hash in hashes:
+                if hash in self._records:
+                    self._records.move_to_end(hash)
+                    nodes[hash] = self._records[hash][0]
+                    self.hits += 1
+                elif self._missing.get(hash, 0.0) > now:
+                    self.hits += 1
+                else:
+                    self._missing.pop(hash, None)
+                    uncached.append(hash)
+                    self.misses += 1
+        return nodes, uncached
+
+    def _store(
+        self, requested: list[str], found: dict[str, InstanceDatabase.NodeData]
+    ) -> None:
+        with self._lock:
+            if self.negative_ttl > 0:
+                expires = time.monotonic() + self.negative_ttl
+                for hash in requested:
+                    if hash not in found:
+                        self._missing[hash] = expires
+            for hash, node in found.items():
+                if hash in self._records or not node.output_path:
+                    continue
+                size = len(repr(node))
+                self._records[hash] = (copy.deepcopy(node), size)
+                self.nbytes += size
+            while len(self._records) > self.max_entries or (
+                self.max_bytes is not None
+                and self.nbytes > self.max_bytes
+                and self._records
+            ):
+                _, (_, size) = self._records.popitem(last=False)
+                self.nbytes -= size
+
+    def _invalidate(self, hash: str) -> None:
+        with self._lock:
+            self._missing.pop(hash, None)
+            if hash in self._records:
+                _, size = self._records.pop(hash)
+                self.nbytes -= size
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import abc
+from collections.abc import Iterable
 from dataclasses import dataclass
 
 
@@ -48,6 +49,23 @@ class InstanceDatabase(abc.ABC):
         """
         pass
 
+    @abc.abstractmethod
+    def create_many(self, nodes: list[NodeData]) -> list[str]:
+        """
+        Create many new entries in the database at once.
+
+        Nodes with the same hash are only sent once and nodes that already exist in
+        the database are skipped. Nodes have to be given in topological order, i.e.
+        every node after the nodes connected to its inputs.
+
+        Args:
+            nodes (list[NodeData]): The data of the nodes to be created.
+
+        Returns:
+            list[str]: The hashes of the given nodes.
+        """
+        pass
+
     @abc.abstractmethod
     def read(self, hash: str) -> NodeData | None:
         """
@@ -61,6 +79,45 @@ class InstanceDatabase(abc.ABC):
         """
         pass
 
+    @abc.abstractmethod
+    def read_many(self, hashes: list[str]) -> dict[str, NodeData]:
+        """
+        Read the data of many nodes from the database at once.
+
+        Args:
+            hashes (list[str]): The hashes of the nodes to be read.
+
+        Returns:
+            dict[str, NodeData]: The node data by hash. Hashes which are not in the
+                database are missing.
+        """
+        pass
+
+    def read_ancestors(self, hashes: list[str]) -> dict[str, NodeData]:
+        """
+        Read the given nodes and all nodes connected to their inputs recursively.
+
+        The default implementation issues one :meth:`read_many` per level of the
+        graph. Backends which can traverse the graph on the server side should
+        override it.
+
+        Args:
+            hashes (list[str]): The hashes of the nodes to start from.
+
+        Returns:
+            dict[str, NodeData]: The node data by hash. Hashes which are not in the
+                database are missing.
+        """
+        nodes: dict[str, InstanceDatabase.NodeData] = {}
+        requested = set(hashes)
+        frontier = set(hashes)
+        while frontier:
+            found = self.read_many(list(frontier))
+            nodes.update(found)
+            frontier = connected_hashes(found.values()) - requested
+            requested |= frontier
+        return nodes
+
     @abc.abstractmethod
     def update(self, hash: str, **kwargs) -> None:
         """
@@ -86,3 +143,20 @@ class InstanceDatabase(abc.ABC):
             hash (str): The hash of the node to be deleted.
         """
         pass
+
+
+def connected_hashes(nodes: Iterable[InstanceDatabase.NodeData]) -> set[str]:
+    """
+    Collect the hashes of all nodes connected to the inputs of the given nodes.
+
+    Args:
+        nodes (Iterable[InstanceDatabase.NodeData]): The nodes to inspect.
+
+    Returns:
+        set[str]: The hashes of the connected nodes.
+    """
+    return {
+        node.inputs[input_channel].split("@")[0]
+        for node in nodes
+        for input_channel in node.connected_inputs
+    }
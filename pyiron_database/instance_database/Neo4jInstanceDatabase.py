@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import NoReturn
+from typing import Any
 
 try:
     from neo4j import GraphDatabase
@@ -11,8 +11,166 @@ except ImportError as err:
 
 from .InstanceDatabase import InstanceDatabase
 
+INIT_QUERIES = [
+    # replaced by the index backing the uniqueness constraint
+    "DROP INDEX node_hash_index IF EXISTS",
+    "CREATE CONSTRAINT node_hash_unique IF NOT EXISTS "
+    "FOR (n:NODE) REQUIRE n.hash IS UNIQUE",
+]
+
+CONSTRAINT_QUERY = (
+    "SHOW CONSTRAINTS YIELD name WHERE name = 'node_hash_unique' RETURN name"
+)
+
+# databases created before the uniqueness constraint may hold a hash more than once
+DEDUPLICATE_QUERIES = [
+    """
+    MATCH (n :NODE)
+    WITH n, COUNT { (n) -- () } AS degree
+    ORDER BY degree DESC
+    // keep the most connected node of each hash
+    WITH n.hash AS hash, collect(n) AS nodes
+    WHERE size(nodes) > 1
+    UNWIND nodes[1..] AS n
+    WITH n, [(i :INPUT) -[:INPUT]-> (n) | i] + [(n) -[:OUTPUT]-> (o :OUTPUT) | o] AS channels
+    FOREACH (channel IN channels | DETACH DELETE channel)
+    DETACH DELETE n
+    """,
+    # connect the inputs which were connected to the outputs of deleted duplicates
+    """
+    MATCH (i :INPUT)
+    WHERE i.value CONTAINS "@" AND NOT (i) <-[:CONNECTION]- (:OUTPUT)
+    WITH i, split(i.value, "@") AS channel
+    MATCH (:NODE {hash: channel[0]}) -[:OUTPUT]-> (o :OUTPUT {key: channel[1]})
+    MERGE (o) -[:CONNECTION]-> (i)
+    """,
+]
+
+DROP_QUERY = "MATCH (n) DETACH DELETE n"
+
+CREATE_QUERY = """
+UNWIND $nodes AS node
+MERGE (n :NODE {hash: node.hash})
+ON CREATE SET
+    n.name = node.name,
+    n.module = node.module,
+    n.version = node.version,
+    n.output_path = node.output_path
+WITH n, node
+CALL {
+    WITH n, node
+    UNWIND node.inp AS input
+    MERGE (:INPUT {key: input.key, value: input.value}) -[:INPUT]-> (n)
+}
+CALL {
+    WITH n, node
+    UNWIND node.out AS output
+    MERGE (:OUTPUT {key: output.key}) <-[:OUTPUT]- (n)
+}
+CALL {
+    WITH n, node
+    UNWIND node.channels AS channel
+    MATCH (:NODE {hash: channel.output_hash}) -[:OUTPUT]-> (o :OUTPUT {key: channel.output_channel})
+    MATCH (n) <-[:INPUT]- (i :INPUT {key: channel.input_channel})
+    MERGE (o) -[:CONNECTION]-> (i)
+}
+"""
+
+READ_QUERY = """
+UNWIND $hashes AS hash
+MATCH (n :NODE {hash: hash})
+RETURN n,
+    [(i :INPUT) -[:INPUT]-> (n) | i {.key, .value}] AS inputs,
+    [(n) -[:OUTPUT]-> (o :OUTPUT) | o.key] AS outputs
+"""
+
+UPDATE_QUERY = "MATCH (n :NODE {hash: $hash}) SET n += $properties"
+
+DELETE_QUERY = """
+MATCH (n :NODE {hash: $hash})
+WITH n, [(i :INPUT) -[:INPUT]-> (n) | i] + [(n) -[:OUTPUT]-> (o :OUTPUT) | o] AS channels
+FOREACH (channel IN channels | DETACH DELETE channel)
+DETACH DELETE n
+"""
+
+
+def node_parameters(nodes: list[InstanceDatabase.NodeData]) -> list[dict[str, Any]]:
+    """Convert nodes to the parameters of the create queries, one per hash."""
+    return [
+        {
+            "hash": node.hash,
+            "name": node.qualname,
+            "module": node.module,
+            "version": node.version,
+            "output_path": node.output_path if node.output_path else "",
+            "inp": [{"key": k, "value": v} for k, v in node.inputs.items()],
+            "out": [{"key": k} for k in node.outputs],
+            "channels": [
+                {
+                    "input_channel": input_channel,
+                    "output_hash": node.inputs[input_channel].split("@")[0],
+                    "output_channel": node.inputs[input_channel].split("@")[1],
+                }
+                for input_channel in node.connected_inputs
+            ],
+        }
+        for node in {node.hash: node for node in nodes}.values()
+    ]
+
+
+# the node data fields stored as properties of NODE, by property name
+PROPERTIES = {
+    "qualname": "name",
+    "module": "module",
+    "version": "version",
+    "output_path": "output_path",
+}
+
+
+def node_properties(values: dict[str, Any]) -> dict[str, Any]:
+    """
+    Convert node data fields to the properties set by the update query.
+
+    Args:
+        values (dict[str, Any]): The new values by node data field.
+
+    Returns:
+        dict[str, Any]: The new values by property of NODE.
+
+    Raises:
+        KeyError: If a field is not stored as a property, e.g. the inputs.
+    """
+    for column in values:
+        if column not in PROPERTIES:
+            raise KeyError(f"Cannot update column: {column}")
+    return {
+        PROPERTIES[column]: "" if column == "output_path" and not value else value
+        for column, value in values.items()
+    }
+
+
+def record_to_node_data(record: dict[str, Any]) -> InstanceDatabase.NodeData:
+    """Convert a record returned by the read query to node data."""
+    node = record["n"]
+    inputs = {inp["key"]: inp["value"] for inp in record["inputs"]}
+    connected_inputs = [k for k, v in inputs.items() if isinstance(v, str) and "@" in v]
+
+    return InstanceDatabase.NodeData(
+        hash=node["hash"],
+        qualname=node["name"],
+        module=node["module"],
+        version=node["version"],
+        connected_inputs=connected_inputs,
+        inputs=inputs,
+        outputs=list(dict.fromkeys(record["outputs"])),
+        output_path=node["output_path"],
+    )
+
 
 class Neo4jInstanceDatabase(InstanceDatabase):
+    batch_size: int = 1000
+    """Maximum number of nodes per create statement in :meth:`create_many`."""
+
     def __init__(self, uri: str, auth: tuple[str, str]) -> None:
         if FAILED_IMPORT is not None:
             raise ImportError(
@@ -27,146 +185,49 @@ class Neo4jInstanceDatabase(InstanceDatabase):
 
     def init(self) -> None:
         with self.driver.session(database="neo4j") as session:
-            session.run(
-                "CREATE INDEX node_hash_index IF NOT EXISTS FOR (n:NODE) ON (n.hash)"
-            )
+            if session.run(CONSTRAINT_QUERY).single() is None:
+                for query in DEDUPLICATE_QUERIES:
+                    session.run(query)
+            for query in INIT_QUERIES:
+                session.run(query)
 
     def drop(self) -> None:
         with self.driver.session(database="neo4j") as session:
-            session.run("MATCH (n) DETACH DELETE n")
+            session.run(DROP_QUERY)
 
     def create(
         self,
         node: InstanceDatabase.NodeData,
     ) -> str:
-        with self.driver.session(database="neo4j").begin_transaction() as tx:
-            inp = [{"key": k, "value": v} for k, v in node.inputs.items()]
-            out = [{"key": k} for k in node.outputs]
-            channels = [
-                {
-                    "input_channel": input_channel,
-                    "output_hash": node.inputs[input_channel].split("@")[0],
-                    "output_channel": node.inputs[input_channel].split("@")[1],
-                }
-                for input_channel in node.connected_inputs
-            ]
-            tx.run(
-                """
-                MERGE (n :NODE {hash: $hash, name:$name, module:$module, version:$version, output_path:$output_path})
-                """,
-                hash=node.hash,
-                name=node.qualname,
-                module=node.module,
-                version=node.version,
-                output_path=node.output_path if node.output_path else "",
-                inp=inp,
-                out=out,
-                channels=channels,
-            )
-            tx.run(
-                """
-                MATCH (n :NODE {hash: $hash})
-                WITH n, $inp AS inp
-                UNWIND inp AS input
-                MERGE (:INPUT {key:input.key, value:input.value}) -[:INPUT]-> (n)
-                """,
-                hash=node.hash,
-                name=node.qualname,
-                module=node.module,
-                version=node.version,
-                output_path=node.output_path if node.output_path else "",
-                inp=inp,
-                out=out,
-                channels=channels,
-            )
-            tx.run(
-                """
-                MATCH (n :NODE {hash: $hash})
-                WITH n, $out AS out
-                UNWIND out AS output
-                MERGE (:OUTPUT {key:output.key}) <-[:OUTPUT]- (n)
-                """,
-                hash=node.hash,
-                name=node.qualname,
-                module=node.module,
-                version=node.version,
-                output_path=node.output_path if node.output_path else "",
-                inp=inp,
-                out=out,
-                channels=channels,
-            )
-            tx.run(
-                """
-                MATCH (n :NODE {hash: $hash})
-                WITH n AS input_node, $channels AS channels
-                UNWIND channels AS channel
-                MATCH (output_node:NODE {hash: channel.output_hash}) -[:OUTPUT]-> (o:OUTPUT {key:channel.output_channel})
-                MATCH (input_node) <-[:INPUT]- (i:INPUT {key:channel.input_channel})
-                MERGE (o)-[:CONNECTION]->(i)
-                """,
-                hash=node.hash,
-                name=node.qualname,
-                module=node.module,
-                version=node.version,
-                output_path=node.output_path if node.output_path else "",
-                inp=inp,
-                out=out,
-                channels=channels,
-            )
-            tx.commit()
-        return node.hash
+        return self.create_many([node])[0]
+
+    def create_many(self, nodes: list[InstanceDatabase.NodeData]) -> list[str]:
+        def create_nodes(tx, parameters: list[dict]) -> None:
+            # in order, so the upstream nodes of a batch exist when it is created
+            for start in range(0, len(parameters), self.batch_size):
+                tx.run(CREATE_QUERY, nodes=parameters[start : start + self.batch_size])
+
+        with self.driver.session(database="neo4j") as session:
+            session.execute_write(create_nodes, parameters=node_parameters(nodes))
+        return [node.hash for node in nodes]
 
     def read(self, hash: str) -> InstanceDatabase.NodeData | None:
-        def node_graph(tx, hash: str):
-            result = tx.run(
-                """
-                MATCH (n {hash:$hash})
-                OPTIONAL MATCH (n) --> (o)
-                OPTIONAL MATCH (n) <-- (i)
-                RETURN n, o, i
-                """,
-                hash=hash,
-            )
-            return list(result)
+        return self.read_many([hash]).get(hash)
+
+    def read_many(self, hashes: list[str]) -> dict[str, InstanceDatabase.NodeData]:
+        def read_nodes(tx, hashes: list[str]) -> list[dict[str, Any]]:
+            return tx.run(READ_QUERY, hashes=hashes).data()
 
         with self.driver.session(database="neo4j") as session:
-            records = session.execute_read(
-                node_graph,
-                hash=hash,
-            )
+            records = session.execute_read(read_nodes, hashes=hashes)
 
-        node = records[0].data()["n"]
-        inputs = {
-            inp["key"]: inp["value"]
-            for inp in (rec.data()["i"] for rec in records)
-            if inp is not None
-        }
-        connected_inputs = [
-            k for k, v in inputs.items() if isinstance(v, str) and "@" in v
-        ]
-        outputs = list({rec.data()["o"]["key"] for rec in records})
-
-        res = self.NodeData(
-            hash=node["hash"],
-            qualname=node["name"],
-            module=node["module"],
-            version=node["version"],
-            connected_inputs=connected_inputs,
-            inputs=inputs,
-            outputs=outputs,
-            output_path=node["output_path"],
-        )
-        return res
-
-    def update(self, hash: str, **kwargs) -> NoReturn:
-        raise NotImplementedError
+        nodes = (record_to_node_data(record) for record in records)
+        return {node.hash: node for node in nodes}
+
+    def update(self, hash: str, **kwargs) -> None:
+        with self.driver.session(database="neo4j") as session:
+            session.run(UPDATE_QUERY, hash=hash, properties=node_properties(kwargs))
 
     def delete(self, hash: str) -> None:
         with self.driver.session(database="neo4j") as session:
-            session.run(
-                """
-                MATCH (i: INPUT) -[:INPUT]-> (n {hash:$hash}) -[:OUTPUT]-> (o: OUTPUT) 
-                DETACH DELETE n, i , o
-                """,
-                hash=hash,
-            )
+            session.run(DELETE_QUERY, hash=hash)
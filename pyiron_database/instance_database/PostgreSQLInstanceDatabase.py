@@ -1,8 +1,24 @@
 from __future__ import annotations
 
+import contextlib
+import threading
+from collections.abc import Iterator
+from dataclasses import asdict
+from typing import Any
+
 try:
-    from sqlalchemy import Column, MetaData, String, Table, create_engine
+    from sqlalchemy import (
+        Column,
+        MetaData,
+        String,
+        Table,
+        bindparam,
+        create_engine,
+        text,
+    )
     from sqlalchemy.dialects.postgresql import JSONB, insert
+    from sqlalchemy.engine import Connection
+    from sqlalchemy.sql.elements import TextClause
 
     FAILED_IMPORT = None
 except ImportError as err:
@@ -12,28 +28,116 @@ except ImportError as err:
 from .InstanceDatabase import InstanceDatabase
 
 
+def node_table(metadata: MetaData) -> Table:
+    return Table(
+        "nodes",
+        metadata,
+        Column("hash", String, primary_key=True),
+        Column("qualname", String, nullable=True),
+        Column("module", String, nullable=True),
+        Column("version", String, nullable=True),
+        Column("connected_inputs", JSONB, nullable=True),
+        Column("inputs", JSONB, nullable=True),
+        Column("outputs", JSONB, nullable=True),
+        Column("output_path", String, nullable=True),
+    )
+
+
+def read_ancestors_statement() -> TextClause:
+    """Select the given nodes and all their ancestors with a recursive query."""
+    return text(
+        """
+        WITH RECURSIVE ancestors(hash) AS (
+            SELECT hash FROM nodes WHERE hash IN :hashes
+            UNION
+            SELECT split_part(n.inputs ->> c.input_channel, '@', 1)
+            FROM nodes AS n
+            JOIN ancestors AS a ON n.hash = a.hash
+            CROSS JOIN LATERAL jsonb_array_elements_text(n.connected_inputs)
+                AS c(input_channel)
+        )
+        SELECT nodes.* FROM nodes JOIN ancestors ON nodes.hash = ancestors.hash
+        """
+    ).bindparams(bindparam("hashes", expanding=True))
+
+
 class PostgreSQLInstanceDatabase(InstanceDatabase):
-    def __init__(self, connection_string: str, echo: bool = False) -> None:
+    batch_size: int = 1000
+    """Maximum number of rows per INSERT statement in :meth:`create_many`."""
+
+    def __init__(
+        self,
+        connection_string: str,
+        echo: bool = False,
+        *,
+        pool_size: int = 5,
+        max_overflow: int = 10,
+        pool_timeout: float = 30.0,
+        pool_recycle: int = -1,
+        pool_pre_ping: bool = False,
+    ) -> None:
         if FAILED_IMPORT is not None:
             raise ImportError(
                 f"{type(self)} requires '{FAILED_IMPORT}' to be installed."
             )
 
         self.metadata = MetaData()
-        self.table = Table(
-            "nodes",
-            self.metadata,
-            Column("hash", String, primary_key=True),
-            Column("qualname", String, nullable=True),
-            Column("module", String, nullable=True),
-            Column("version", String, nullable=True),
-            Column("connected_inputs", JSONB, nullable=True),
-            Column("inputs", JSONB, nullable=True),
-            Column("outputs", JSONB, nullable=True),
-            Column("output_path", String, nullable=True),
+        self.table = node_table(self.metadata)
+
+        self.engine = create_engine(
+            connection_string,
+            echo=echo,
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            pool_timeout=pool_timeout,
+            pool_recycle=pool_recycle,
+            pool_pre_ping=pool_pre_ping,
         )
+        self._local = threading.local()
+
+    def close(self) -> None:
+        self.engine.dispose()
 
-        self.engine = create_engine(connection_string, echo=echo)
+    @property
+    def pool_status(self) -> dict[str, Any]:
+        """The current state of the connection pool."""
+        pool = self.engine.pool
+        return {
+            "size": pool.size(),  # type: ignore[attr-defined]
+            "checked_in": pool.checkedin(),  # type: ignore[attr-defined]
+            "checked_out": pool.checkedout(),  # type: ignore[attr-defined]
+            "overflow": pool.overflow(),  # type: ignore[attr-defined]
+        }
+
+    @contextlib.contextmanager
+    def transaction(self) -> Iterator[Connection]:
+        """
+        Share one connection and transaction between all operations in this block.
+
+        The transaction is committed when the block is left and rolled back if it is
+        left with an exception. Nested blocks join the outer transaction. The
+        connection is only shared within the current thread.
+
+        Yields:
+            Connection: The connection used by all operations of this thread.
+        """
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            yield connection
+            return
+
+        with self.engine.begin() as connection:
+            self._local.connection = connection
+            try:
+                yield connection
+            finally:
+                self._local.connection = None
+
+    def _connect(self) -> contextlib.AbstractContextManager[Connection]:
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            return contextlib.nullcontext(connection)
+        return self.engine.begin()
 
     def init(self) -> None:
         self.metadata.create_all(self.engine)
@@ -45,7 +149,7 @@ class PostgreSQLInstanceDatabase(InstanceDatabase):
         self,
         node: InstanceDatabase.NodeData,
     ) -> str:
-        with self.engine.connect() as connection:
+        with self._connect() as connection:
             stmt = (
                 insert(self.table)
                 .values(
@@ -61,21 +165,49 @@ class PostgreSQLInstanceDatabase(InstanceDatabase):
                 .on_conflict_do_nothing()
             )
             result = connection.execute(stmt)
-            connection.commit()
             return result.inserted_primary_key[0]
 
+    def create_many(self, nodes: list[InstanceDatabase.NodeData]) -> list[str]:
+        unique_nodes = list({node.hash: node for node in nodes}.values())
+        with self._connect() as connection:
+            for start in range(0, len(unique_nodes), self.batch_size):
+                rows = [
+                    asdict(node)
+                    for node in unique_nodes[start : start + self.batch_size]
+                ]
+                stmt = insert(self.table).values(rows).on_conflict_do_nothing()
+                connection.execute(stmt)
+        return [node.hash for node in nodes]
+
     def read(self, hash: str) -> InstanceDatabase.NodeData | None:
-        with self.engine.connect() as connection:
+        with self._connect() as connection:
             stmt = self.table.select().where(self.table.c.hash == hash)
             result = connection.execute(stmt).first()
             return None if result is None else self.NodeData(**result._mapping)
 
+    def read_many(self, hashes: list[str]) -> dict[str, InstanceDatabase.NodeData]:
+        nodes = {}
+        with self._connect() as connection:
+            for start in range(0, len(hashes), self.batch_size):
+                stmt = self.table.select().where(
+                    self.table.c.hash.in_(hashes[start : start + self.batch_size])
+                )
+                for row in connection.execute(stmt):
+                    nodes[row.hash] = self.NodeData(**row._mapping)
+        return nodes
+
+    def read_ancestors(self, hashes: list[str]) -> dict[str, InstanceDatabase.NodeData]:
+        stmt = read_ancestors_statement()
+        with self._connect() as connection:
+            rows = connection.execute(stmt, {"hashes": hashes})
+            return {row.hash: self.NodeData(**row._mapping) for row in rows}
+
     def update(self, hash: str, **kwargs) -> None:
-        with self.engine.connect() as connection:
+        with self._connect() as connection:
             stmt = self.table.update().where(self.table.c.hash == hash).values(**kwargs)
             connection.execute(stmt)
 
     def delete(self, hash: str) -> None:
-        with self.engine.connect() as connection:
+        with self._connect() as connection:
             stmt = self.table.delete().where(self.table.c.hash == hash)
             connection.execute(stmt)
@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+import contextlib
+import json
+import os
+import sqlite3
+import threading
+from collections.abc import Iterator
+from dataclasses import fields
+from pathlib import Path
+from typing import Any
+
+from .InstanceDatabase import InstanceDatabase
+
+COLUMNS = [field.name for field in fields(InstanceDatabase.NodeData)]
+JSON_COLUMNS = {"connected_inputs", "inputs", "outputs"}
+
+CREATE_TABLE = """
+CREATE TABLE IF NOT EXISTS nodes (
+    hash TEXT PRIMARY KEY,
+    qualname TEXT,
+    module TEXT,
+    version TEXT,
+    connected_inputs TEXT,
+    inputs TEXT,
+    outputs TEXT,
+    output_path TEXT
+)
+"""
+
+# the hashes of the nodes connected to the inputs of each node, kept next to the
+# JSON columns so ancestors are found without parsing inputs, which may hold NaN
+CREATE_CONNECTIONS = """
+CREATE TABLE IF NOT EXISTS connections (
+    hash TEXT NOT NULL,
+    upstream TEXT NOT NULL,
+    PRIMARY KEY (hash, upstream)
+) WITHOUT ROWID
+"""
+
+INSERT = (
+    f"INSERT OR IGNORE INTO nodes ({', '.join(COLUMNS)}) "
+    f"VALUES ({', '.join('?' for _ in COLUMNS)})"
+)
+
+INSERT_CONNECTION = "INSERT OR IGNORE INTO connections (hash, upstream) VALUES (?, ?)"
+
+SELECT = f"SELECT {', '.join(COLUMNS)} FROM nodes WHERE hash = ?"
+
+SELECT_MANY = (
+    f"SELECT {', '.join(COLUMNS)} FROM nodes "
+    "WHERE hash IN (SELECT value FROM json_each(?))"
+)
+
+SELECT_ANCESTORS = f"""
+WITH RECURSIVE ancestors(hash) AS (
+    SELECT value FROM json_each(?)
+    UNION
+    SELECT c.upstream
+    FROM ancestors AS a
+    JOIN connections AS c ON c.hash = a.hash
+)
+SELECT {", ".join(f"nodes.{column}" for column in COLUMNS)}
+FROM nodes JOIN ancestors ON nodes.hash = ancestors.hash
+"""
+
+
+class SQLiteInstanceDatabase(InstanceDatabase):
+    """
+    Instance database stored in a single SQLite file.
+
+    The database runs in WAL mode, so readers do not block the writer and several
+    processes on the same machine can use the same file. Every thread and process
+    opens its own connection. Writes take the database lock up front and wait up to
+    timeout seconds for it. Inputs and outputs are stored as JSON text, and the
+    connections between nodes in a separate table for :meth:`read_ancestors`.
+
+    Args:
+        path (str): The path of the database file.
+        timeout (float): Seconds to wait for the lock held by another connection.
+    """
+
+    def __init__(self, path: str, timeout: float = 30.0) -> None:
+        self.path = Path(path)
+        self.timeout = timeout
+        self._local = threading.local()
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """The connection of the current thread."""
+        connection = getattr(self._local, "connection", None)
+        if connection is None or self._local.pid != os.getpid():
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(
+                self.path,
+                timeout=self.timeout,
+                isolation_level=None,
+                check_same_thread=False,
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+    def close(self) -> None:
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+    @contextlib.contextmanager
+    def _write(self) -> Iterator[sqlite3.Connection]:
+        connection = self.connection
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            yield connection
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        connection.execute("COMMIT")
+
+    def _to_row(self, node: InstanceDatabase.NodeData) -> tuple[Any, ...]:
+        return tuple(
+            json.dumps(getattr(node, column))
+            if column in JSON_COLUMNS
+            else getattr(node, column)
+            for column in COLUMNS
+        )
+
+    @staticmethod
+    def _connections(node: InstanceDatabase.NodeData) -> list[tuple[str, str]]:
+        return [
+            (node.hash, node.inputs[input_channel].split("@")[0])
+            for input_channel in node.connected_inputs
+        ]
+
+    def _to_node_data(self, row: tuple[Any, ...]) -> InstanceDatabase.NodeData:
+        return self.NodeData(
+            **{
+                column: json.loads(value) if column in JSON_COLUMNS else value
+                for column, value in zip(COLUMNS, row, strict=True)
+            }
+        )
+
+    def init(self) -> None:
+        with self._write() as connection:
+            connection.execute(CREATE_TABLE)
+            connection.execute(CREATE_CONNECTIONS)
+
+    def drop(self) -> None:
+        with self._write() as connection:
+            connection.execute("DROP TABLE IF EXISTS nodes")
+            connection.execute("DROP TABLE IF EXISTS connections")
+
+    def create(self, node: InstanceDatabase.NodeData) -> str:
+        return self.create_many([node])[0]
+
+    def create_many(self, nodes: list[InstanceDatabase.NodeData]) -> list[str]:
+        unique_nodes = {node.hash: node for node in nodes}.values()
+        with self._write() as connection:
+            connection.executemany(
+                INSERT, (self._to_row(node) for node in unique_nodes)
+            )
+            connection.executemany(
+                INSERT_CONNECTION,
+                (edge for node in unique_nodes for edge in self._connections(node)),
+            )
+        return [node.hash for node in nodes]
+
+    def read(self, hash: str) -> InstanceDatabase.NodeData | None:
+        row = self.connection.execute(SELECT, (hash,)).fetchone()
+        return None if row is None else self._to_node_data(row)
+
+    def read_many(self, hashes: list[str]) -> dict[str, InstanceDatabase.NodeData]:
+        rows = self.connection.execute(SELECT_MANY, (json.dumps(hashes),))
+        return {row[0]: self._to_node_data(row) for row in rows}
+
+    def read_ancestors(self, hashes: list[str]) -> dict[str, InstanceDatabase.NodeData]:
+        rows = self.connection.execute(SELECT_ANCESTORS, (json.dumps(hashes),))
+        return {row[0]: self._to_node_data(row) for row in rows}
+
+    def update(self, hash: str, **kwargs) -> None:
+        for column in kwargs:
+            if column not in COLUMNS:
+                raise KeyError(f"Unknown column: {column}")
+        assignments = ", ".join(f"{column} = ?" for column in kwargs)
+        values = [
+            json.dumps(value) if column in JSON_COLUMNS else value
+            for column, value in kwargs.items()
+        ]
+        with self._write() as connection:
+            connection.execute(
+                f"UPDATE nodes SET {assignments} WHERE hash = ?", (*values, hash)
+            )
+            if kwargs.keys() & {"inputs", "connected_inputs"}:
+                row = connection.execute(SELECT, (hash,)).fetchone()
+                connection.execute("DELETE FROM connections WHERE hash = ?", (hash,))
+                if row is not None:
+                    connection.executemany(
+                        INSERT_CONNECTION, self._connections(self._to_node_data(row))
+                    )
+
+    def delete(self, hash: str) -> None:
+        with self._write() as connection:
+            connection.execute("DELETE FROM nodes WHERE hash = ?", (hash,))
+            connection.execute("DELETE FROM connections WHERE hash = ?", (hash,))
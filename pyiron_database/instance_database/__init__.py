@@ -1,23 +1,75 @@
+from pyiron_database.instance_database.async_node import (
+    async_restore_node_from_database,
+    async_restore_nodes_from_database,
+    async_store_node_in_database,
+    async_store_workflow_in_database,
+)
+from pyiron_database.instance_database.AsyncNeo4jInstanceDatabase import (
+    AsyncNeo4jInstanceDatabase,
+)
+from pyiron_database.instance_database.AsyncPostgreSQLInstanceDatabase import (
+    AsyncPostgreSQLInstanceDatabase,
+)
+from pyiron_database.instance_database.CachedInstanceDatabase import (
+    CachedInstanceDatabase,
+)
+from pyiron_database.instance_database.caching_executor import CachingExecutor
+from pyiron_database.instance_database.hash_index import HashIndex
+from pyiron_database.instance_database.hashing import (
+    CanonicalHasher,
+    hash_value,
+    set_default_hash_algorithm,
+)
 from pyiron_database.instance_database.Neo4jInstanceDatabase import (
     Neo4jInstanceDatabase,
 )
 from pyiron_database.instance_database.node import (
     get_hash,
+    hash_workflow,
     restore_node_from_database,
     restore_node_outputs,
+    restore_nodes_from_database,
     store_node_in_database,
     store_node_outputs,
+    store_workflow_in_database,
+)
+from pyiron_database.instance_database.output_store import (
+    OutputStore,
+    set_default_output_store,
 )
+from pyiron_database.instance_database.output_writer import OutputWriter
 from pyiron_database.instance_database.PostgreSQLInstanceDatabase import (
     PostgreSQLInstanceDatabase,
 )
+from pyiron_database.instance_database.SQLiteInstanceDatabase import (
+    SQLiteInstanceDatabase,
+)
 
 __all__ = [
+    "AsyncNeo4jInstanceDatabase",
+    "AsyncPostgreSQLInstanceDatabase",
+    "CachedInstanceDatabase",
+    "CanonicalHasher",
+    "HashIndex",
+    "CachingExecutor",
+    "OutputStore",
+    "OutputWriter",
     "PostgreSQLInstanceDatabase",
     "Neo4jInstanceDatabase",
+    "SQLiteInstanceDatabase",
+    "async_restore_node_from_database",
+    "async_restore_nodes_from_database",
+    "async_store_node_in_database",
+    "async_store_workflow_in_database",
     "get_hash",
+    "hash_value",
+    "hash_workflow",
     "restore_node_from_database",
+    "restore_nodes_from_database",
     "restore_node_outputs",
+    "set_default_hash_algorithm",
+    "set_default_output_store",
     "store_node_in_database",
     "store_node_outputs",
+    "store_workflow_in_database",
 ]
@@ -0,0 +1,137 @@
+import asyncio
+from collections.abc import Iterable
+
+from pyiron_workflow.node import Node
+from pyiron_workflow.workflow import Workflow
+
+from .AsyncInstanceDatabase import AsyncInstanceDatabase
+from .node import (
+    get_hash,
+    jsongroup_to_node_data,
+    node_data_to_nodes,
+    node_to_jsongroup,
+    nodes_to_node_data,
+    store_node_outputs,
+)
+
+
+async def async_store_node_in_database(
+    db: AsyncInstanceDatabase,
+    node: Node,
+    store_outputs: bool = False,
+    store_input_nodes_recursively: bool = False,
+) -> str:
+    """
+    Store a node in a database without blocking the event loop.
+
+    See :func:`store_node_in_database`. Hashing and writing the outputs run in a
+    worker thread.
+
+    Args:
+        db (AsyncInstanceDatabase): The database to store the node in.
+        node (Node): The node to store.
+        store_outputs (bool): Whether to store the outputs of the node as well.
+        store_input_nodes_recursively (bool): Whether to store all the nodes that are
+            connected to the inputs of the node recursively.
+
+    Returns:
+        str: The hash of the stored node.
+    """
+    if store_input_nodes_recursively:
+        hashes = await async_store_nodes_in_database(
+            db, [node], store_outputs=store_outputs
+        )
+        return hashes[node]
+
+    hashes = {}
+    node_hash = await asyncio.to_thread(get_hash, node, hashes)
+    node_jsongroup = await asyncio.to_thread(node_to_jsongroup, node, hashes)
+    output_path = None
+    if store_outputs:
+        output_path = await asyncio.to_thread(store_node_outputs, node, hashes)
+
+    node_data = jsongroup_to_node_data(node_jsongroup, output_path, node_hash)
+    await db.create(node_data)
+    return node_data.hash
+
+
+async def async_store_nodes_in_database(
+    db: AsyncInstanceDatabase, nodes: Iterable[Node], store_outputs: bool = False
+) -> dict[Node, str]:
+    """
+    Store nodes and all the nodes connected to their inputs in a database.
+
+    See :func:`store_nodes_in_database`.
+
+    Args:
+        db (AsyncInstanceDatabase): The database to store the nodes in.
+        nodes (Iterable[Node]): The nodes to store.
+        store_outputs (bool): Whether to store the outputs of the nodes as well.
+
+    Returns:
+        dict[Node, str]: The hashes of all stored nodes.
+    """
+    hashes, node_data = await asyncio.to_thread(
+        nodes_to_node_data, list(nodes), store_outputs
+    )
+    await db.create_many(node_data)
+    return hashes
+
+
+async def async_store_workflow_in_database(
+    db: AsyncInstanceDatabase, workflow: Workflow, store_outputs: bool = False
+) -> dict[Node, str]:
+    """
+    Store all nodes of a workflow in a database.
+
+    Args:
+        db (AsyncInstanceDatabase): The database to store the nodes in.
+        workflow (Workflow): The workflow whose nodes should be stored.
+        store_outputs (bool): Whether to store the outputs of the nodes as well.
+
+    Returns:
+        dict[Node, str]: The hash of every stored node.
+    """
+    return await async_store_nodes_in_database(
+        db, workflow.children.values(), store_outputs=store_outputs
+    )
+
+
+async def async_restore_node_from_database(
+    db: AsyncInstanceDatabase, node_hash: str, parent: Workflow | None = None
+) -> Node:
+    """
+    Restore a node from the database.
+
+    See :func:`restore_node_from_database`.
+
+    Args:
+        db (AsyncInstanceDatabase): The database to read from.
+        node_hash (str): The hash of the node to restore.
+        parent (Workflow | None): The workflow to add the restored node to.
+
+    Returns:
+        Node: The restored node.
+    """
+    nodes = await async_restore_nodes_from_database(db, [node_hash], parent)
+    return nodes[node_hash]
+
+
+async def async_restore_nodes_from_database(
+    db: AsyncInstanceDatabase, node_hashes: list[str], parent: Workflow | None = None
+) -> dict[str, Node]:
+    """
+    Restore nodes and all the nodes connected to their inputs from the database.
+
+    See :func:`restore_nodes_from_database`.
+
+    Args:
+        db (AsyncInstanceDatabase): The database to read from.
+        node_hashes (list[str]): The hashes of the nodes to restore.
+        parent (Workflow | None): The workflow to add the restored nodes to.
+
+    Returns:
+        dict[str, Node]: The restored nodes (including the upstream nodes) by hash.
+    """
+    db_results = await db.read_ancestors(node_hashes)
+    return node_data_to_nodes(db_results, node_hashes, parent)
@@ -0,0 +1,250 @@
+from __future__ import annotations
+
+import contextlib
+import os
+import socket
+import time
+import uuid
+from functools import partial
+from pathlib import Path
+
+from pyiron_workflow.node import Node
+from pyiron_workflow.workflow import Workflow
+
+from .hash_index import HashIndex
+from .InstanceDatabase import InstanceDatabase
+from .node import (
+    get_hash,
+    hash_nodes,
+    jsongroup_to_node_data,
+    node_to_jsongroup,
+    restore_node_outputs,
+    store_node_outputs,
+    upstream_nodes,
+)
+from .output_store import OutputStore
+from .output_writer import OutputWriter
+
+
+class CachingExecutor:
+    """
+    Run nodes, but restore their outputs from the database whenever possible.
+
+    Before a node is run its hash is looked up in the database. If a record with
+    stored outputs exists, the outputs are restored instead of running the node.
+    Otherwise the node is run and, if requested, its outputs are stored.
+
+    While a node is computed an in-progress marker file is held, which is created
+    atomically. Other workers (threads or processes sharing the marker directory)
+    that want to compute the same hash wait for the marker to disappear and then
+    restore the outputs instead of computing them again. The marker holds the host
+    name and process id of its owner, so a marker left behind by a killed process
+    on the same host is removed by the next worker which finds it.
+
+    Args:
+        db (InstanceDatabase): The database to look up and store nodes in.
+        store_outputs (bool): Whether to store the outputs of nodes that were run.
+        marker_dir (str): The directory holding the in-progress markers.
+        poll_interval (float): Seconds between checks of a marker held by another
+            worker.
+        stale_after (float | None): Seconds after which any marker is considered
+            abandoned and removed, e.g. markers of workers on other hosts. None
+            only removes markers whose owner is known to be dead.
+        output_store (OutputStore | None): Where outputs are stored. Defaults to
+            the store of output_writer or :attr:`OutputStore.default`.
+        output_writer (OutputWriter | None): Writes the outputs in the background.
+            The record references them and the in-progress marker is released
+            once they are written.
+    """
+
+    def __init__(
+        self,
+        db: InstanceDatabase,
+        store_outputs: bool = True,
+        marker_dir: str = ".storage",
+        poll_interval: float = 0.1,
+        stale_after: float | None = None,
+        *,
+        output_store: OutputStore | None = None,
+        output_writer: OutputWriter | None = None,
+    ) -> None:
+        self.db = db
+        self.store_outputs = store_outputs
+        self.marker_dir = Path(marker_dir)
+        self.poll_interval = poll_interval
+        self.stale_after = stale_after
+        if output_store is None and output_writer is not None:
+            output_store = output_writer.store
+        self.output_store = output_store
+        self.output_writer = output_writer
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        """The fraction of lookups which were served from the database."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def run(self, node: Node, hashes: dict[Node, str] | None = None) -> bool:
+        """
+        Restore the outputs of a node or run it.
+
+        The input of the node is fetched from its connections before it is run, the
+        nodes connected to its inputs are not run.
+
+        Args:
+            node (Node): The node to run.
+            hashes (dict[Node, str] | None): hashes of already hashed nodes, see
+                :func:`get_hash`.
+
+        Returns:
+            bool: True if the outputs were restored, False if the node was run.
+        """
+        node_hash = get_hash(node, hashes)
+        while True:
+            record = self.db.read(node_hash)
+            if self._restore(node, record, hashes):
+                return True
+            if self._mark_in_progress(node_hash):
+                break
+            time.sleep(self.poll_interval)
+
+        marker = self._marker(node_hash)
+        release_marker = True
+        try:
+            # another worker may have finished between the lookup and the marker
+            record = self.db.read(node_hash)
+            if self._restore(node, record, hashes):
+                return True
+
+            node.run(run_data_tree=False, fetch_input=True, emit_ran_signal=False)
+            self.misses += 1
+
+            if self.store_outputs and self.output_writer is not None:
+                if record is None:
+                    node_jsongroup = node_to_jsongroup(node, hashes)
+                    self.db.create(
+                        jsongroup_to_node_data(node_jsongroup, node_hash=node_hash)
+                    )
+                future = self.output_writer.submit(
+                    node, hashes, partial(self._set_output_path, node_hash)
+                )
+                release_marker = False
+                future.add_done_callback(lambda _: marker.unlink(missing_ok=True))
+            elif self.store_outputs:
+                output_path = store_node_outputs(node, hashes, store=self.output_store)
+                if record is None:
+                    node_jsongroup = node_to_jsongroup(node, hashes)
+                    self.db.create(
+                        jsongroup_to_node_data(node_jsongroup, output_path, node_hash)
+                    )
+                else:
+                    self.db.update(node_hash, output_path=output_path)
+        finally:
+            if release_marker:
+                marker.unlink(missing_ok=True)
+        return False
+
+    def _set_output_path(self, node_hash: str, output_path: str) -> None:
+        self.db.update(node_hash, output_path=output_path)
+
+    def run_workflow(
+        self, workflow: Workflow, hash_index: HashIndex | None = None
+    ) -> dict[Node, str]:
+        """
+        Restore or run all nodes of a workflow in topological order.
+
+        Args:
+            workflow (Workflow): The workflow to run.
+            hash_index (HashIndex | None): An index of the workflow's hashes which
+                is updated instead of hashing all nodes again, e.g. when the same
+                workflow is run repeatedly with a few changed inputs.
+
+        Returns:
+            dict[Node, str]: The hash of every node of the workflow.
+
+        Raises:
+            ValueError: If hash_index belongs to another workflow.
+        """
+        if hash_index is None:
+            nodes = upstream_nodes(workflow.children.values())
+            hashes = hash_nodes(nodes)
+        elif hash_index.workflow is workflow:
+            hashes = dict(hash_index.update())
+            nodes = list(hashes)
+        else:
+            raise ValueError("The hash index belongs to another workflow")
+        for node in nodes:
+            self.run(node, hashes)
+        return hashes
+
+    def _restore(
+        self,
+        node: Node,
+        record: InstanceDatabase.NodeData | None,
+        hashes: dict[Node, str] | None,
+    ) -> bool:
+        if record is None or not record.output_path:
+            return False
+        store = OutputStore.default if self.output_store is None else self.output_store
+        if not store.exists(record.hash):
+            return False
+        restore_node_outputs(node, hashes, store=store)
+        self.hits += 1
+        return True
+
+    def _marker(self, node_hash: str) -> Path:
+        return self.marker_dir / f"{node_hash}.in_progress"
+
+    def _mark_in_progress(self, node_hash: str) -> bool:
+        marker = self._marker(node_hash)
+        marker.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            fd = os.open(marker, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            with contextlib.suppress(FileNotFoundError):
+                self._remove_if_abandoned(marker)
+            return False
+        with os.fdopen(fd, "w") as file:
+            file.write(f"{socket.gethostname()} {os.getpid()}")
+        return True
+
+    def _remove_if_abandoned(self, marker: Path) -> None:
+        inode = marker.stat().st_ino
+        if not self._is_abandoned(marker):
+            return
+        # another worker may have replaced the marker by now, so claim it atomically
+        # and put it back if it is not the abandoned one
+        claimed = marker.with_name(f"{marker.name}.{uuid.uuid4().hex}")
+        os.rename(marker, claimed)
+        try:
+            if claimed.stat().st_ino != inode:
+                with contextlib.suppress(FileExistsError):
+                    os.link(claimed, marker)
+        finally:
+            claimed.unlink()
+
+    def _is_abandoned(self, marker: Path) -> bool:
+        if (
+            self.stale_after is not None
+            and time.time() - marker.stat().st_mtime > self.stale_after
+        ):
+            return True
+        # an empty marker is still being written by its owner
+        host, _, pid = marker.read_text().partition(" ")
+        return (
+            host == socket.gethostname()
+            and pid.isdigit()
+            and not _process_exists(int(pid))
+        )
+
+
+def _process_exists(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
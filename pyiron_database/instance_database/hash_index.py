@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+from typing import Any
+
+from pyiron_workflow.node import Node
+from pyiron_workflow.workflow import Workflow
+
+from .hashing import hash_value
+from .node import node_description, upstream_nodes
+
+# per input: its label, whether it is connected and the connected output channel
+# or the value
+_Sources = list[tuple[str, bool, Any]]
+
+
+def _input_sources(node: Node) -> _Sources:
+    return [
+        (label, True, input.connections[0])
+        if input.connected
+        else (label, False, input.value)
+        for label, input in node.inputs.items()
+    ]
+
+
+def _same_sources(new: _Sources, old: _Sources) -> bool:
+    return len(new) == len(old) and all(
+        label == old_label and connected == old_connected and source is old_source
+        for (label, connected, source), (old_label, old_connected, old_source) in zip(
+            new, old, strict=True
+        )
+    )
+
+
+class HashIndex:
+    """
+    The hashes of all nodes of a workflow, updated incrementally.
+
+    For every node the index records its hash and where each of its inputs comes
+    from, i.e. the upstream output it is connected to or its value. :meth:`update`
+    compares these with the current inputs and rehashes only the nodes whose
+    inputs were reassigned or reconnected, and the nodes downstream of them. Like
+    in a Merkle tree, a downstream node is only rehashed if the hash of one of its
+    upstream nodes actually changed.
+
+    Input values are compared by identity, so a value which is changed in place
+    is not noticed and its node must be passed to :meth:`invalidate`.
+
+    Args:
+        workflow (Workflow): The workflow whose nodes are hashed.
+    """
+
+    def __init__(self, workflow: Workflow) -> None:
+        self.workflow = workflow
+        self.hashes: dict[Node, str] = {}
+        self.rehashed = 0
+        self._sources: dict[Node, _Sources] = {}
+        self._invalid: set[Node] = set()
+
+    def invalidate(self, node: Node) -> None:
+        """Rehash a node on the next update, e.g. after changing an input in place."""
+        self._invalid.add(node)
+
+    def update(self) -> dict[Node, str]:
+        """
+        Rehash the nodes whose inputs or upstream hashes changed.
+
+        Nodes which were added to the workflow are hashed, removed nodes are
+        dropped. The number of rehashed nodes is kept in :attr:`rehashed`.
+
+        Returns:
+            dict[Node, str]: The hash of every node of the workflow (and of every
+                node connected to them) in topological order.
+        """
+        hashes: dict[Node, str] = {}
+        sources: dict[Node, _Sources] = {}
+        changed: set[Node] = set()
+        self.rehashed = 0
+        for node in upstream_nodes(self.workflow.children.values()):
+            sources[node] = _input_sources(node)
+            old_hash = self.hashes.get(node)
+            if (
+                old_hash is None
+                or node in self._invalid
+                or not _same_sources(sources[node], self._sources[node])
+                or any(
+                    source.owner in changed
+                    for _, connected, source in sources[node]
+                    if connected
+                )
+            ):
+                hashes[node] = hash_value(node_description(node, hashes))
+                self.rehashed += 1
+                if hashes[node] != old_hash:
+                    changed.add(node)
+            else:
+                hashes[node] = old_hash
+
+        self.hashes = hashes
+        self._sources = sources
+        self._invalid.clear()
+        return hashes
@@ -0,0 +1,221 @@
+from __future__ import annotations
+
+import dataclasses
+import hashlib
+import math
+from json.encoder import encode_basestring_ascii
+from typing import Any, ClassVar
+
+import numpy as np
+
+from pyiron_database.generic_storage import JSONGroup, codec_registry
+
+# JSON text is ASCII only, so these markers never collide with JSON values
+_TUPLE = b"\x00tuple"
+_BYTES = b"\x00bytes"
+_ARRAY = b"\x00ndarray"
+_DATACLASS = b"\x00dataclass"
+_OBJECT = b"\x00object"
+
+
+class CanonicalHasher:
+    """
+    Hash values from a canonical encoding which is fed to the hash incrementally.
+
+    JSON compatible values are encoded exactly like
+    `json.dumps(value, sort_keys=True)`, so their SHA-256 hashes match those of
+    the JSON text. Arrays and NumPy scalars are hashed from their dtype, shape and
+    raw data in chunks of chunk_size bytes without converting them. Tuples, bytes
+    and dataclasses are encoded with their type, and any other value is encoded
+    the way :class:`JSONGroup` stores it.
+
+    SHA-256 digests are returned as plain hex strings, digests of other
+    algorithms are prefixed with the algorithm, e.g. `"blake2b-..."`.
+
+    Args:
+        algorithm (str | None): The name of a :mod:`hashlib` algorithm. Defaults
+            to :attr:`default_algorithm`.
+        chunk_size (int): The number of bytes passed to the hash at once.
+
+    Raises:
+        ValueError: If the algorithm has no fixed digest size, like SHAKE.
+
+    Attributes:
+        default_algorithm (ClassVar[str]): The algorithm used when none is given,
+            see :func:`set_default_hash_algorithm`.
+    """
+
+    default_algorithm: ClassVar[str] = "sha256"
+
+    def __init__(self, algorithm: str | None = None, chunk_size: int = 1 << 20) -> None:
+        self.algorithm = self.default_algorithm if algorithm is None else algorithm
+        self.chunk_size = chunk_size
+        self._hash = hashlib.new(self.algorithm)
+        if not self._hash.digest_size:
+            raise ValueError(f"{self.algorithm} has no fixed digest size")
+        self._buffer = bytearray()
+
+    def update(self, value: Any) -> None:
+        """Feed the canonical encoding of a value to the hash."""
+        self._encode(value)
+        self._flush()
+
+    def hexdigest(self) -> str:
+        """The digest of all values so far, prefixed unless it is SHA-256."""
+        self._flush()
+        digest = self._hash.hexdigest()
+        return digest if self.algorithm == "sha256" else f"{self.algorithm}-{digest}"
+
+    def _write(self, data: bytes) -> None:
+        self._buffer += data
+        if len(self._buffer) >= self.chunk_size:
+            self._flush()
+
+    def _flush(self) -> None:
+        if self._buffer:
+            self._hash.update(self._buffer)
+            self._buffer.clear()
+
+    def _encode(self, value: Any) -> None:
+        if value is None:
+            self._write(b"null")
+        elif value is True:
+            self._write(b"true")
+        elif value is False:
+            self._write(b"false")
+        elif isinstance(value, str):
+            self._write(encode_basestring_ascii(value).encode())
+        elif isinstance(value, int):
+            self._write(int.__repr__(value).encode())
+        elif isinstance(value, float):
+            self._write(_float_repr(value).encode())
+        elif isinstance(value, dict):
+            self._encode_dict(value)
+        elif isinstance(value, list):
+            self._encode_list(value)
+        elif isinstance(value, np.ndarray | np.generic):
+            self._encode_array(np.asarray(value))
+        elif isinstance(value, tuple):
+            self._write(_TUPLE)
+            self._encode_list(value)
+        elif isinstance(value, bytes | bytearray | memoryview):
+            data = memoryview(value).cast("B")
+            self._write(_BYTES + f"({data.nbytes})".encode())
+            self._flush()
+            self._hash.update(data)
+        elif dataclasses.is_dataclass(value) and not isinstance(value, type):
+            cls = value.__class__
+            self._write(_DATACLASS)
+            self._encode(f"{cls.__module__}.{cls.__qualname__}")
+            if codec_registry.fields_only(value):
+                names = codec_registry.field_names(cls)
+                self._encode_dict({name: getattr(value, name) for name in names})
+            else:
+                self._encode_dict(vars(value))
+        else:
+            self._encode_object(value)
+
+    def _encode_dict(self, value: dict) -> None:
+        self._write(b"{")
+        for i, (key, item) in enumerate(sorted(value.items())):
+            if i:
+                self._write(b", ")
+            self._encode(_json_key(key))
+            self._write(b": ")
+            self._encode(item)
+        self._write(b"}")
+
+    def _encode_list(self, value: list | tuple) -> None:
+        self._write(b"[")
+        for i, item in enumerate(value):
+            if i:
+                self._write(b", ")
+            self._encode(item)
+        self._write(b"]")
+
+    def _encode_array(self, array: np.ndarray) -> None:
+        dtype = array.dtype
+        # the str of structured and subarray dtypes is only their size, e.g. "|V16"
+        layout = (
+            dtype.str
+            if dtype.fields is None and dtype.subdtype is None
+            else dtype.descr
+        )
+        self._write(_ARRAY + f"({layout!r}, {array.shape})".encode())
+        if array.dtype.hasobject:
+            self._encode_list(array.ravel().tolist())
+            return
+
+        self._flush()
+        if array.ndim == 0 or array.flags.c_contiguous:
+            data = np.ascontiguousarray(array).reshape(-1).view(np.uint8)
+            for start in range(0, data.size, self.chunk_size):
+                self._hash.update(data[start : start + self.chunk_size].data)
+            return
+
+        # copy a bounded number of rows at a time into C order
+        rows = max(1, self.chunk_size // max(1, array[0].nbytes))
+        for start in range(0, len(array), rows):
+            block = np.ascontiguousarray(array[start : start + rows])
+            self._hash.update(block.reshape(-1).view(np.uint8).data)
+
+    def _encode_object(self, value: Any) -> None:
+        group = JSONGroup({})
+        group["value"] = value
+        encoded = group.data["value"]
+        if encoded is value:
+            raise TypeError(f"Cannot hash values of type {type(value)}")
+        self._write(_OBJECT)
+        self._encode(encoded)
+
+
+def _float_repr(value: float) -> str:
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "Infinity" if value > 0 else "-Infinity"
+    return float.__repr__(value)
+
+
+def _json_key(key: Any) -> str:
+    if isinstance(key, str):
+        return key
+    if key is None or isinstance(key, bool):
+        return {None: "null", True: "true", False: "false"}[key]
+    if isinstance(key, int):
+        return int.__repr__(key)
+    if isinstance(key, float):
+        return _float_repr(key)
+    raise TypeError(f"keys must be str, int, float, bool or None, not {type(key)}")
+
+
+def hash_value(value: Any, algorithm: str | None = None) -> str:
+    """
+    Hash a value from its canonical encoding, see :class:`CanonicalHasher`.
+
+    Args:
+        value (Any): The value to hash.
+        algorithm (str | None): The name of a :mod:`hashlib` algorithm. Defaults
+            to :attr:`CanonicalHasher.default_algorithm`.
+
+    Returns:
+        str: The hex digest, prefixed with the algorithm unless it is SHA-256.
+    """
+    hasher = CanonicalHasher(algorithm)
+    hasher.update(value)
+    return hasher.hexdigest()
+
+
+def set_default_hash_algorithm(algorithm: str) -> None:
+    """
+    Set the :mod:`hashlib` algorithm used for hashes when none is given.
+
+    Args:
+        algorithm (str): The name of the algorithm.
+
+    Raises:
+        ValueError: If the algorithm has no fixed digest size, like SHAKE.
+    """
+    if not hashlib.new(algorithm).digest_size:
+        raise ValueError(f"{algorithm} has no fixed digest size")
+    CanonicalHasher.default_algorithm = algorithm
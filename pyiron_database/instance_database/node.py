@@ -1,134 +1,301 @@
-import hashlib
-import json
 from collections.abc import Iterable
-from typing import Any
+from functools import partial
+from typing import TYPE_CHECKING, Any
 
 from pyiron_workflow import NOT_DATA
 from pyiron_workflow.node import Node
+from pyiron_workflow.type_hinting import valid_value
 from pyiron_workflow.workflow import Workflow
 
-from pyiron_database.generic_storage import HDF5Storage, JSONGroup
+from pyiron_database.generic_storage import (
+    HDF5StoragePolicy,
+    JSONGroup,
+    LazyDataset,
+)
 from pyiron_database.obj_reconstruction.util import get_type, recreate_obj
 
+from .hashing import hash_value
 from .InstanceDatabase import InstanceDatabase
+from .output_store import OutputStore
 
+if TYPE_CHECKING:
+    from .output_writer import OutputWriter
 
-def store_node_outputs(node: Node) -> str:
+
+def store_node_outputs(
+    node: Node,
+    hashes: dict[Node, str] | None = None,
+    policy: HDF5StoragePolicy | None = None,
+    store: OutputStore | None = None,
+) -> str:
     """
     Store a node's outputs into an HDF5 file.
 
+    See :func:`node_output_values` for which outputs are stored.
+
     Args:
         node (Node): The node whose outputs should be stored.
+        hashes (dict[Node, str] | None): hashes of already hashed nodes, see
+            :func:`get_hash`.
+        policy (HDF5StoragePolicy | None): chunking and compression of the
+            outputs, per output name via its outputs field. Defaults to the
+            global policy of the HDF5 storage.
+        store (OutputStore | None): where to store the outputs. Defaults to
+            :attr:`OutputStore.default`.
 
     Returns:
         str: The file path where the node's outputs are stored.
+    """
+    node_hash = get_hash(node, hashes)
+    store = OutputStore.default if store is None else store
+    return store.write(node_hash, node_output_values(node), policy)
+
+
+def node_output_values(node: Node) -> dict[str, Any]:
+    """
+    Collect the outputs of a node which differ from their defaults.
+
+    Args:
+        node (Node): The node whose outputs should be collected.
+
+    Returns:
+        dict[str, Any]: The output values by name.
 
     Raises:
         ValueError: If any output of the node is NOT_DATA.
     """
-    node_hash = get_hash(node)
-    output_path = f".storage/{node_hash}.hdf5"
-    with HDF5Storage(output_path, "w") as storage:
-        for k, v in node.outputs.items():
-            is_default_check = v.value == v.default
-            if isinstance(is_default_check, Iterable):
-                if hasattr(is_default_check, "all"):
-                    if is_default_check.all():
-                        continue
-                elif all(is_default_check):
+    values = {}
+    for k, v in node.outputs.items():
+        is_default_check = v.value == v.default
+        if isinstance(is_default_check, Iterable):
+            if hasattr(is_default_check, "all"):
+                if is_default_check.all():
                     continue
-            elif is_default_check:
+            elif all(is_default_check):
                 continue
+        elif is_default_check:
+            continue
 
-            if v.value is NOT_DATA:
-                raise ValueError(f"Output '{k}' has no value.")
-            storage[k] = v.value
-    return output_path
+        if v.value is NOT_DATA:
+            raise ValueError(f"Output '{k}' has no value.")
+        values[k] = v.value
+    return values
 
 
-def restore_node_outputs(node: Node) -> bool:
+def restore_node_outputs(
+    node: Node,
+    hashes: dict[Node, str] | None = None,
+    lazy: bool = False,
+    store: OutputStore | None = None,
+) -> bool:
     """
     Restore a node's outputs from a stored HDF5 file, given by node.hash.
 
+    Values which already match the type hint of their output are assigned
+    without conversion.
+
     Args:
         node (Node): the node whose outputs should be restored.
+        hashes (dict[Node, str] | None): hashes of already hashed nodes, see
+            :func:`get_hash`.
+        lazy (bool): Restore numeric arrays as read-only memory maps or, for
+            chunked datasets, as :class:`LazyDataset` views that are only read
+            on access. Lazy views of outputs with an array type hint are loaded.
+        store (OutputStore | None): where the outputs are stored. Defaults to
+            :attr:`OutputStore.default`.
 
     Returns:
         bool: True if the outputs were restored, False if not.
     """
 
-    node_hash = get_hash(node)
-    output_path = f".storage/{node_hash}.hdf5"
-    with HDF5Storage(output_path, "r") as storage:
+    node_hash = get_hash(node, hashes)
+    store = OutputStore.default if store is None else store
+    with store.open(node_hash, lazy) as storage:
         for k, v in storage.items():
-            node.outputs[k].value = node.outputs[k].type_hint(v)
+            channel = node.outputs[k]
+            channel.value = _convert_to_hint(v, channel.type_hint)
     return True
 
 
+def _convert_to_hint(value: Any, type_hint: Any) -> Any:
+    if type_hint is None or valid_value(value, type_hint):
+        return value
+    if isinstance(value, LazyDataset):
+        value = value[()]
+        if valid_value(value, type_hint):
+            return value
+    return type_hint(value)
+
+
 def recreate_node(
     module: str, qualname: str, version: str, init_args: dict[str, Any]
 ) -> Node:
     return recreate_obj(module, qualname, version, init_args)
 
 
-def node_to_jsongroup(node: Node) -> JSONGroup:
-    module, qualname, version = get_type(node)
-    connected_inputs = [input.label for input in node.inputs if input.connected]
+def node_to_jsongroup(node: Node, hashes: dict[Node, str] | None = None) -> JSONGroup:
     json_group = JSONGroup({})
-    json_group.update(
-        {
-            "inputs": node_inputs_to_jsongroup(node).data,
-            "outputs": [o for o, _ in node.outputs.items()],
-            "node": {
-                "qualname": qualname,
-                "module": module,
-                "version": version,
-                "connected_inputs": connected_inputs,
-            },
-        }
-    )
+    json_group.update(node_description(node, hashes))
     return json_group
 
 
-def get_hash(obj_to_be_hashed: Node | JSONGroup) -> str:
+def node_description(
+    node: Node, hashes: dict[Node, str] | None = None
+) -> dict[str, Any]:
+    """
+    Describe a node by its class, its inputs and the names of its outputs.
+
+    Input values are not converted, connected inputs are given by the hash of the
+    upstream node and the output label. This is what the hash of a node is
+    calculated from, and :func:`node_to_jsongroup` stores.
+
+    Args:
+        node (Node): The node to describe.
+        hashes (dict[Node, str] | None): hashes of already hashed nodes, see
+            :func:`get_hash`.
+
+    Returns:
+        dict[str, Any]: The description of the node.
+    """
+    module, qualname, version = get_type(node)
+    connected_inputs = [input.label for input in node.inputs if input.connected]
+    return {
+        "inputs": node_inputs(node, hashes),
+        "outputs": [o for o, _ in node.outputs.items()],
+        "node": {
+            "qualname": qualname,
+            "module": module,
+            "version": version,
+            "connected_inputs": connected_inputs,
+        },
+    }
+
+
+def get_hash(
+    obj_to_be_hashed: Node | JSONGroup, hashes: dict[Node, str] | None = None
+) -> str:
     """
     Calculate the hash of a given node or JSONGroup.
 
     Args:
         obj_to_be_hashed (Node | JSONGroup): the object whose hash should be calculated.
+        hashes (dict[Node, str] | None): hashes of already hashed nodes. Upstream
+            nodes found in here are not hashed again and newly hashed nodes are
+            added to it.
 
     Returns:
-        str: the SHA-256 hash of the object.
+        str: the hash of the object, see :func:`hash_value`.
     """
-    node_jsongroup = (
-        obj_to_be_hashed
-        if isinstance(obj_to_be_hashed, JSONGroup)
-        else node_to_jsongroup(obj_to_be_hashed)
-    )
-    jsonified_dict = json.dumps(node_jsongroup.data, sort_keys=True)
+    if isinstance(obj_to_be_hashed, JSONGroup):
+        # the stored values are encoded, the hash of a node is of the decoded ones
+        return hash_value(_decode_group(obj_to_be_hashed))
+
+    if hashes is not None and obj_to_be_hashed in hashes:
+        return hashes[obj_to_be_hashed]
+    return hash_nodes([obj_to_be_hashed], hashes)[obj_to_be_hashed]
 
-    hasher = hashlib.sha256()
-    hasher.update(jsonified_dict.encode("utf-8"))
-    hash_value = hasher.hexdigest()
 
-    return hash_value
+def _decode_group(group: JSONGroup) -> dict[str, Any]:
+    return {
+        key: _decode_group(value) if isinstance(value, JSONGroup) else value
+        for key, value in ((key, group[key]) for key in group)
+    }
 
 
-def node_inputs_to_jsongroup(node: Node) -> JSONGroup:
+def upstream_nodes(nodes: Iterable[Node], skip: Iterable[Node] = ()) -> list[Node]:
+    """
+    Collect the given nodes and all nodes connected to their inputs.
+
+    The graph is traversed iteratively, so arbitrarily long chains do not hit the
+    recursion limit.
+
+    Args:
+        nodes (Iterable[Node]): the nodes to start from.
+        skip (Iterable[Node]): nodes which are neither returned nor traversed.
+
+    Returns:
+        list[Node]: the nodes in topological order, i.e. every node comes after all
+            the nodes connected to its inputs.
+    """
+    order = []
+    visited = set(skip)
+    stack = [(node, False) for node in reversed(list(nodes))]
+    while stack:
+        node, expanded = stack.pop()
+        if expanded:
+            order.append(node)
+            continue
+        if node in visited:
+            continue
+        visited.add(node)
+        stack.append((node, True))
+        for input in node.inputs:
+            if input.connected:
+                input_node = input.connections[0].owner
+                if input_node not in visited:
+                    stack.append((input_node, False))
+    return order
+
+
+def hash_nodes(
+    nodes: Iterable[Node], hashes: dict[Node, str] | None = None
+) -> dict[Node, str]:
+    """
+    Calculate the hashes of the given nodes and all their upstream nodes.
+
+    Every node is hashed exactly once, in topological order, so the hashes of
+    shared upstream nodes are reused instead of being recalculated for every
+    downstream node.
+
+    Args:
+        nodes (Iterable[Node]): the nodes to hash.
+        hashes (dict[Node, str] | None): hashes of already hashed nodes. It is
+            updated in place. The hashes are only valid as long as the inputs of
+            the nodes are not modified.
+
+    Returns:
+        dict[Node, str]: the hashes of all visited nodes.
+    """
+    hashes = {} if hashes is None else hashes
+    for node in upstream_nodes(nodes, skip=hashes):
+        hashes[node] = hash_value(node_description(node, hashes))
+    return hashes
+
+
+def hash_workflow(workflow: Workflow) -> dict[Node, str]:
+    """
+    Calculate the hashes of all nodes of a workflow in a single pass.
+
+    Args:
+        workflow (Workflow): the workflow whose nodes should be hashed.
+
+    Returns:
+        dict[Node, str]: the hash of every child of the workflow (and of every node
+            connected to them).
+    """
+    return hash_nodes(workflow.children.values())
+
+
+def node_inputs_to_jsongroup(
+    node: Node, hashes: dict[Node, str] | None = None
+) -> JSONGroup:
+    json_group = JSONGroup({})
+    json_group.update(node_inputs(node, hashes))
+    return json_group
+
+
+def node_inputs(node: Node, hashes: dict[Node, str] | None = None) -> dict[str, Any]:
     def resolve_connections(value: Any) -> Any:
         if value.connected:
             return (
-                get_hash(value.connections[0].owner) + "@" + value.connections[0].label
+                get_hash(value.connections[0].owner, hashes)
+                + "@"
+                + value.connections[0].label
             )
         else:
             return value.value
 
-    output = {k: resolve_connections(v) for k, v in node.inputs.items()}
-
-    json_group = JSONGroup({})
-    json_group.update(output)
-
-    return json_group
+    return {k: resolve_connections(v) for k, v in node.inputs.items()}
 
 
 def node_outputs_to_dict(node: Node) -> JSONGroup:
@@ -137,11 +304,30 @@ def node_outputs_to_dict(node: Node) -> JSONGroup:
     return output
 
 
+def jsongroup_to_node_data(
+    node_jsongroup: JSONGroup,
+    output_path: str | None = None,
+    node_hash: str | None = None,
+) -> InstanceDatabase.NodeData:
+    node_dict = node_jsongroup.data
+    return InstanceDatabase.NodeData(
+        hash=get_hash(node_jsongroup) if node_hash is None else node_hash,
+        qualname=node_dict["node"]["qualname"],
+        module=node_dict["node"]["module"],
+        version=node_dict["node"]["version"],
+        connected_inputs=node_dict["node"]["connected_inputs"],
+        inputs=node_dict["inputs"],
+        outputs=node_dict["outputs"],
+        output_path=output_path,
+    )
+
+
 def store_node_in_database(
     db: InstanceDatabase,
     node: Node,
     store_outputs: bool = False,
     store_input_nodes_recursively: bool = False,
+    writer: "OutputWriter | None" = None,
 ) -> str:
     """
     Store a node in a database.
@@ -156,41 +342,128 @@ def store_node_in_database(
         store_outputs (bool): Whether to store the outputs of the node as well.
         store_input_nodes_recursively (bool): Whether to store all the nodes that are
             connected to the inputs of the node recursively.
+        writer (OutputWriter | None): Writes the outputs in the background. The
+            record references them once they are written.
 
     Returns:
         str: The hash of the stored node.
     """
     if store_input_nodes_recursively:
-        connected_nodes = [
-            input.connections[0].owner for input in node.inputs if input.connected
-        ]
-        for connected_node in connected_nodes:
-            store_node_in_database(
-                db,
-                connected_node,
-                store_outputs=store_outputs,
-                store_input_nodes_recursively=store_input_nodes_recursively,
-            )
+        return store_nodes_in_database(
+            db, [node], store_outputs=store_outputs, writer=writer
+        )[node]
 
-    node_jsongroup = node_to_jsongroup(node)
-    node_hash = get_hash(node_jsongroup)
-    node_dict = node_jsongroup.data
+    hashes: dict[Node, str] = {}
+    node_jsongroup = node_to_jsongroup(node, hashes)
     output_path = None
-    if store_outputs:
-        output_path = store_node_outputs(node)
+    if store_outputs and writer is None:
+        output_path = store_node_outputs(node, hashes)
 
-    node_data = InstanceDatabase.NodeData(
-        hash=node_hash,
-        qualname=node_dict["node"]["qualname"],
-        module=node_dict["node"]["module"],
-        version=node_dict["node"]["version"],
-        connected_inputs=node_dict["node"]["connected_inputs"],
-        inputs=node_dict["inputs"],
-        outputs=node_dict["outputs"],
-        output_path=output_path,
+    node_data = jsongroup_to_node_data(
+        node_jsongroup, output_path, get_hash(node, hashes)
     )
     db.create(node_data)
-    return node_hash
+    if store_outputs and writer is not None:
+        writer.submit(
+            node, {node: node_data.hash}, partial(_set_output_path, db, node_data.hash)
+        )
+    return node_data.hash
+
+
+def _set_output_path(db: InstanceDatabase, node_hash: str, output_path: str) -> None:
+    db.update(node_hash, output_path=output_path)
+
+
+def store_nodes_in_database(
+    db: InstanceDatabase,
+    nodes: Iterable[Node],
+    store_outputs: bool = False,
+    writer: "OutputWriter | None" = None,
+) -> dict[Node, str]:
+    """
+    Store nodes and all the nodes connected to their inputs in a database.
+
+    Every node is hashed once and every distinct hash is sent once, all of them in
+    a single call to :meth:`InstanceDatabase.create_many`.
+
+    Args:
+        db (InstanceDatabase): The database to store the nodes in.
+        nodes (Iterable[Node]): The nodes to store.
+        store_outputs (bool): Whether to store the outputs of the nodes as well.
+        writer (OutputWriter | None): Writes the outputs in the background. The
+            records reference them once they are written.
+
+    Returns:
+        dict[Node, str]: The hashes of all stored nodes.
+    """
+    if writer is None:
+        hashes, node_data = nodes_to_node_data(nodes, store_outputs=store_outputs)
+        db.create_many(node_data)
+        return hashes
+
+    hashes, node_data = nodes_to_node_data(nodes)
+    db.create_many(node_data)
+    if store_outputs:
+        submitted = set()
+        for node, node_hash in hashes.items():
+            if node_hash not in submitted:
+                submitted.add(node_hash)
+                writer.submit(node, hashes, partial(_set_output_path, db, node_hash))
+    return hashes
+
+
+def nodes_to_node_data(
+    nodes: Iterable[Node], store_outputs: bool = False
+) -> tuple[dict[Node, str], list[InstanceDatabase.NodeData]]:
+    """
+    Convert nodes and all the nodes connected to their inputs to database records.
+
+    Args:
+        nodes (Iterable[Node]): The nodes to convert.
+        store_outputs (bool): Whether to store the outputs of the nodes as well.
+
+    Returns:
+        tuple[dict[Node, str], list[InstanceDatabase.NodeData]]: The hashes of all
+            visited nodes and one record per distinct hash in topological order.
+    """
+    hashes: dict[Node, str] = {}
+    node_data: dict[str, InstanceDatabase.NodeData] = {}
+    for node in upstream_nodes(nodes):
+        node_hash = get_hash(node, hashes)
+        if node_hash in node_data:
+            continue
+
+        output_path = None
+        if store_outputs:
+            output_path = store_node_outputs(node, hashes)
+        node_data[node_hash] = jsongroup_to_node_data(
+            node_to_jsongroup(node, hashes), output_path, node_hash
+        )
+    return hashes, list(node_data.values())
+
+
+def store_workflow_in_database(
+    db: InstanceDatabase,
+    workflow: Workflow,
+    store_outputs: bool = False,
+    writer: "OutputWriter | None" = None,
+) -> dict[Node, str]:
+    """
+    Store all nodes of a workflow in a database.
+
+    Args:
+        db (InstanceDatabase): The database to store the nodes in.
+        workflow (Workflow): The workflow whose nodes should be stored.
+        store_outputs (bool): Whether to store the outputs of the nodes as well.
+        writer (OutputWriter | None): Writes the outputs in the background. The
+            records reference them once they are written.
+
+    Returns:
+        dict[Node, str]: The hash of every stored node.
+    """
+    return store_nodes_in_database(
+        db, workflow.children.values(), store_outputs=store_outputs, writer=writer
+    )
 
 
 def restore_node_from_database(
@@ -211,14 +484,52 @@ def restore_node_from_database(
 
     Returns:
         Node: The restored node.
+    """
+    return restore_nodes_from_database(db, [node_hash], parent)[node_hash]
+
+
+def restore_nodes_from_database(
+    db: InstanceDatabase, node_hashes: list[str], parent: Workflow | None = None
+) -> dict[str, Node]:
+    """
+    Restore nodes and all the nodes connected to their inputs from the database.
+
+    All required node data is fetched up front with
+    :meth:`InstanceDatabase.read_ancestors`. Afterwards every distinct hash is
+    instantiated exactly once and the connections between the nodes are restored.
+
+    Args:
+        db (InstanceDatabase): The InstanceDatabase instance to read from.
+        node_hashes (list[str]): The hashes of the nodes to restore.
+        parent (Workflow | None): The workflow to add the restored nodes to.
+
+    Returns:
+        dict[str, Node]: The restored nodes (including the upstream nodes) by hash.
+    """
+    db_results = db.read_ancestors(node_hashes)
+    return node_data_to_nodes(db_results, node_hashes, parent)
+
+
+def node_data_to_nodes(
+    db_results: dict[str, InstanceDatabase.NodeData],
+    node_hashes: list[str],
+    parent: Workflow | None = None,
+) -> dict[str, Node]:
+    """
+    Instantiate nodes from database records and connect them.
+
+    Args:
+        db_results (dict[str, InstanceDatabase.NodeData]): The records of the nodes
+            to restore and of all nodes connected to their inputs, by hash.
+        node_hashes (list[str]): The hashes of the nodes which were requested.
+        parent (Workflow | None): The workflow to add the restored nodes to.
+
+    Returns:
+        dict[str, Node]: The restored nodes by hash.
 
     Raises:
-        RuntimeError: If the node with the given hash is not found in the database.
+        RuntimeError: If a node with a required hash is not in db_results.
     """
-    # restore node
-    db_result = db.read(node_hash)
-    if db_result is None:
-        raise RuntimeError(f"Node with hash {node_hash} not found in database.")
 
     def generate_random_string(length: int = 20) -> str:
         import random
@@ -227,23 +538,36 @@ def restore_node_from_database(
         letters = string.ascii_letters + string.digits
         return "".join(random.choice(letters) for i in range(length))
 
-    node = recreate_node(
-        module=db_result.module,
-        qualname=db_result.qualname,
-        version=db_result.version,
-        init_args={"label": generate_random_string()},
-    )
-    if parent is not None:
-        parent.add_child(node)
+    for node_hash in node_hashes:
+        if node_hash not in db_results:
+            raise RuntimeError(f"Node with hash {node_hash} not found in database.")
+
+    # restore nodes
+    nodes = {}
+    for node_hash, db_result in db_results.items():
+        node = recreate_node(
+            module=db_result.module,
+            qualname=db_result.qualname,
+            version=db_result.version,
+            init_args={"label": generate_random_string()},
+        )
+        if parent is not None:
+            parent.add_child(node)
+        nodes[node_hash] = node
 
-    restored_inputs = JSONGroup(db_result.inputs)
     # restore inputs
-    for k, v in restored_inputs.items():
-        if k in db_result.connected_inputs:
-            input_hash, input_label = v.split("@")
-            input_node = restore_node_from_database(db, input_hash, parent)
-            node.inputs[k].connect(input_node.outputs[input_label])
-        else:
-            node.inputs[k] = v
-
-    return node
+    for node_hash, db_result in db_results.items():
+        node = nodes[node_hash]
+        restored_inputs = JSONGroup(db_result.inputs)
+        for k, v in restored_inputs.items():
+            if k in db_result.connected_inputs:
+                input_hash, input_label = v.split("@")
+                if input_hash not in nodes:
+                    raise RuntimeError(
+                        f"Node with hash {input_hash} not found in database."
+                    )
+                node.inputs[k].connect(nodes[input_hash].outputs[input_label])
+            else:
+                node.inputs[k] = v
+
+    return nodes
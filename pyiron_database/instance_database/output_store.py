@@ -0,0 +1,430 @@
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import os
+import sqlite3
+import tempfile
+import threading
+from collections.abc import Iterator, Mapping
+from pathlib import Path
+from typing import Any, ClassVar
+
+import h5py
+import numpy as np
+
+from pyiron_database.generic_storage import (
+    HDF5Group,
+    HDF5Storage,
+    HDF5StoragePolicy,
+    LazyDataset,
+)
+from pyiron_database.generic_storage.hdf5_storage import LIBVER
+
+CREATE_INDEX = [
+    """
+    CREATE TABLE IF NOT EXISTS outputs (
+        hash TEXT PRIMARY KEY,
+        pack TEXT NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS blobs (
+        digest TEXT PRIMARY KEY,
+        refs INTEGER NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS blob_refs (
+        hash TEXT NOT NULL,
+        digest TEXT NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS blob_refs_hash ON blob_refs (hash)",
+]
+
+
+def content_digest(array: np.ndarray) -> str:
+    """The sha256 digest of an array's dtype, shape and data."""
+    digest = hashlib.sha256(f"{array.dtype.str}{array.shape}".encode())
+    digest.update(np.ascontiguousarray(array).data)
+    return digest.hexdigest()
+
+
+class OutputStore:
+    """
+    Where the outputs of nodes are stored, addressed by node hash.
+
+    By default every node gets its own HDF5 file in a sharded directory tree,
+    e.g. `root/ab/abcdef....hdf5`, so no directory holds more than a fraction of
+    the files. In pack mode the outputs of many nodes are appended as groups to a
+    few large HDF5 files in `root/packs`, and an SQLite index in the root maps
+    each hash to its pack file. Both layouts are read with a single lookup.
+
+    With dedup_min_size set, numeric arrays of at least that many bytes are
+    stored once per content in `root/blobs` and the node's outputs hold an HDF5
+    external link to them, which is resolved transparently on reading. The index
+    counts the references to each blob, and :meth:`delete` removes blobs which are
+    no longer referenced.
+
+    Replaced and deleted outputs are removed from their pack file, but HDF5 does
+    not return the space they took; :meth:`compact` rewrites the pack files
+    without it.
+
+    Pack files and blobs are written by one process at a time; the index
+    tolerates concurrent readers.
+
+    Args:
+        root (str): The directory holding the outputs.
+        shard_depth (int): The number of nested shard directories.
+        shard_width (int): The number of hash characters per shard directory.
+        pack (bool): Whether to append outputs to pack files.
+        pack_size (int): The size in bytes after which a new pack file is started.
+        dedup_min_size (int | None): The size in bytes from which arrays are
+            deduplicated. None stores every array with its node.
+
+    Attributes:
+        default (ClassVar[OutputStore]): The store used when none is given, see
+            :func:`set_default_output_store`.
+    """
+
+    default: ClassVar[OutputStore]
+
+    def __init__(
+        self,
+        root: str = ".storage",
+        shard_depth: int = 1,
+        shard_width: int = 2,
+        pack: bool = False,
+        pack_size: int = 1 << 30,
+        *,
+        dedup_min_size: int | None = None,
+    ) -> None:
+        self.root = Path(root)
+        self.shard_depth = shard_depth
+        self.shard_width = shard_width
+        self.pack = pack
+        self.pack_size = pack_size
+        self.dedup_min_size = dedup_min_size
+        self._lock = threading.Lock()
+        self._index_lock = threading.RLock()
+        self._connection: sqlite3.Connection | None = None
+        self._connection_pid: int | None = None
+
+    def path(self, node_hash: str) -> Path:
+        """The file holding the outputs of the given hash in the sharded layout."""
+        # shard on the digest, not the prefix of hashes like "blake2b-..."
+        digest = node_hash.rpartition("-")[2]
+        shards = [
+            digest[i * self.shard_width : (i + 1) * self.shard_width]
+            for i in range(self.shard_depth)
+        ]
+        return self.root.joinpath(*shards, f"{node_hash}.hdf5")
+
+    def exists(self, node_hash: str) -> bool:
+        """Whether outputs are stored for the given hash."""
+        if self.pack:
+            return self._pack_of(node_hash) is not None
+        return self._sharded_path(node_hash) is not None
+
+    def write(
+        self,
+        node_hash: str,
+        values: Mapping[str, Any],
+        policy: HDF5StoragePolicy | None = None,
+    ) -> str:
+        """
+        Store output values under the given hash, replacing stored ones.
+
+        Args:
+            node_hash (str): The hash of the node the outputs belong to.
+            values (Mapping[str, Any]): The outputs by name.
+            policy (HDF5StoragePolicy | None): Chunking and compression of the
+                outputs.
+
+        Returns:
+            str: The path of the file the outputs were written to.
+        """
+        values = dict(values)
+        arrays = {k: values.pop(k) for k in list(values) if self._is_blob(values[k])}
+        blobs = {k: content_digest(v) for k, v in arrays.items()}
+
+        with self._lock:
+            if blobs:
+                # reference the blobs before checking for them, so a concurrent
+                # delete cannot remove them before they are linked
+                with self._index() as index:
+                    self._add_blob_refs(index, list(blobs.values()))
+            written = False
+            try:
+                for k, digest in blobs.items():
+                    self._write_blob(digest, arrays[k], policy, k)
+                path = self._write_outputs(node_hash, values, blobs, policy)
+                written = True
+            finally:
+                if blobs and not written:
+                    with self._index() as index:
+                        self._release_blobs(index, list(blobs.values()))
+
+            if self.pack or blobs or self.dedup_min_size is not None:
+                with self._index() as index:
+                    if self.pack:
+                        index.execute(
+                            "INSERT OR REPLACE INTO outputs (hash, pack) VALUES (?, ?)",
+                            (node_hash, path.name),
+                        )
+                    old = self._replace_blob_refs(index, node_hash, blobs)
+                    self._release_blobs(index, old)
+        return str(path)
+
+    def _write_outputs(
+        self,
+        node_hash: str,
+        values: dict[str, Any],
+        blobs: dict[str, str],
+        policy: HDF5StoragePolicy | None,
+    ) -> Path:
+        if self.pack:
+            # lazy views may read from the pack files, which are changed in place
+            values = {
+                k: np.array(v) if isinstance(v, np.memmap | LazyDataset) else v
+                for k, v in values.items()
+            }
+            path = self._current_pack()
+            old = self._pack_of(node_hash)
+            if old is not None and old != path and old.exists():
+                # the superseded outputs in an older pack would never be read again
+                with h5py.File(old, "a", libver=LIBVER) as file:
+                    file.pop(node_hash, None)
+            with h5py.File(path, "a", libver=LIBVER) as file:
+                if node_hash in file:
+                    del file[node_hash]
+                group = HDF5Group(file.create_group(node_hash), policy)
+                group.update(values)
+                self._link_blobs(group, blobs)
+            return path
+
+        # replace the file instead of truncating it, memory maps of the outputs
+        # restored lazily may still read from it
+        path = self.path(node_hash)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        os.close(fd)
+        try:
+            with HDF5Storage(tmp, "w", policy) as group:
+                group.update(values)
+                self._link_blobs(group, blobs)
+            os.replace(tmp, path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+        return path
+
+    def delete(self, node_hash: str) -> None:
+        """
+        Remove the outputs stored under the given hash and unreferenced blobs.
+
+        Args:
+            node_hash (str): The hash of the node the outputs belong to.
+        """
+        with self._lock:
+            if self.pack:
+                pack = self._pack_of(node_hash)
+                if pack is not None:
+                    with h5py.File(pack, "a", libver=LIBVER) as file:
+                        file.pop(node_hash, None)
+            else:
+                path = self._sharded_path(node_hash)
+                if path is not None:
+                    path.unlink()
+
+            with self._index() as index:
+                index.execute("DELETE FROM outputs WHERE hash = ?", (node_hash,))
+                old = self._replace_blob_refs(index, node_hash, {})
+                self._release_blobs(index, old)
+
+    def compact(self) -> None:
+        """Rewrite the pack files without the space of replaced or deleted outputs."""
+        if not self.pack:
+            return
+        with self._lock:
+            for pack in sorted((self.root / "packs").glob("pack-*.hdf5")):
+                with self._index() as index:
+                    hashes = [
+                        node_hash
+                        for (node_hash,) in index.execute(
+                            "SELECT hash FROM outputs WHERE pack = ?", (pack.name,)
+                        )
+                    ]
+                fd, tmp = tempfile.mkstemp(dir=pack.parent, suffix=".tmp")
+                os.close(fd)
+                try:
+                    with (
+                        h5py.File(pack, "r") as source,
+                        h5py.File(tmp, "w", libver=LIBVER) as target,
+                    ):
+                        for node_hash in hashes:
+                            if node_hash in source:
+                                source.copy(node_hash, target)
+                    os.replace(tmp, pack)
+                finally:
+                    Path(tmp).unlink(missing_ok=True)
+
+    @contextlib.contextmanager
+    def open(self, node_hash: str, lazy: bool = False) -> Iterator[HDF5Group]:
+        """
+        Open the outputs stored under the given hash for reading.
+
+        Args:
+            node_hash (str): The hash of the node the outputs belong to.
+            lazy (bool): Whether to read arrays lazily, see :class:`HDF5Group`.
+
+        Yields:
+            HDF5Group: The stored outputs by name.
+
+        Raises:
+            FileNotFoundError: If no outputs are stored for the hash.
+        """
+        if self.pack:
+            pack = self._pack_of(node_hash)
+            if pack is None:
+                raise FileNotFoundError(f"No outputs stored for {node_hash}")
+            with h5py.File(pack, "r") as file:
+                yield HDF5Group(file[node_hash], lazy=lazy)
+            return
+
+        path = self._sharded_path(node_hash)
+        if path is None:
+            raise FileNotFoundError(f"No outputs stored for {node_hash}")
+        with HDF5Storage(str(path), "r", lazy=lazy) as storage:
+            yield storage
+
+    def blob_path(self, digest: str) -> Path:
+        """The file holding the deduplicated array with the given digest."""
+        return self.root / "blobs" / digest[:2] / f"{digest}.hdf5"
+
+    def _is_blob(self, value: Any) -> bool:
+        return (
+            self.dedup_min_size is not None
+            and isinstance(value, np.ndarray)
+            and value.dtype.kind in "biufc"
+            and value.nbytes >= self.dedup_min_size
+        )
+
+    def _write_blob(
+        self,
+        digest: str,
+        array: np.ndarray,
+        policy: HDF5StoragePolicy | None,
+        key: str,
+    ) -> None:
+        path = self.blob_path(digest)
+        if path.exists():
+            return
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        policy = HDF5Group.default_policy if policy is None else policy
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        os.close(fd)
+        try:
+            with h5py.File(tmp, "w", libver=LIBVER) as file:
+                HDF5Group(file, policy.for_key(key))["value"] = array
+            os.replace(tmp, path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+
+    def _link_blobs(self, group: HDF5Group, blobs: dict[str, str]) -> None:
+        directory = Path(group.data.file.filename).parent
+        for key, digest in blobs.items():
+            target = os.path.relpath(self.blob_path(digest), directory)
+            group.data[key] = h5py.ExternalLink(target, "/value")
+
+    def _add_blob_refs(self, index: sqlite3.Connection, digests: list[str]) -> None:
+        index.executemany(
+            "INSERT INTO blobs (digest, refs) VALUES (?, 1) "
+            "ON CONFLICT (digest) DO UPDATE SET refs = refs + 1",
+            [(digest,) for digest in digests],
+        )
+
+    def _replace_blob_refs(
+        self, index: sqlite3.Connection, node_hash: str, blobs: dict[str, str]
+    ) -> list[str]:
+        """Record the blobs linked by a node and return the ones it linked before."""
+        old = [
+            digest
+            for (digest,) in index.execute(
+                "SELECT digest FROM blob_refs WHERE hash = ?", (node_hash,)
+            )
+        ]
+        index.execute("DELETE FROM blob_refs WHERE hash = ?", (node_hash,))
+        index.executemany(
+            "INSERT INTO blob_refs (hash, digest) VALUES (?, ?)",
+            [(node_hash, digest) for digest in blobs.values()],
+        )
+        return old
+
+    def _release_blobs(self, index: sqlite3.Connection, digests: list[str]) -> None:
+        index.executemany(
+            "UPDATE blobs SET refs = refs - 1 WHERE digest = ?",
+            [(digest,) for digest in digests],
+        )
+        released = [
+            digest
+            for (digest,) in index.execute("SELECT digest FROM blobs WHERE refs <= 0")
+        ]
+        index.execute("DELETE FROM blobs WHERE refs <= 0")
+        # while the index is locked, so no writer references them in between
+        for digest in released:
+            self.blob_path(digest).unlink(missing_ok=True)
+
+    def _sharded_path(self, node_hash: str) -> Path | None:
+        path = self.path(node_hash)
+        if path.exists():
+            return path
+        # files written before sharding was introduced
+        legacy = self.root / f"{node_hash}.hdf5"
+        return legacy if legacy.exists() else None
+
+    @contextlib.contextmanager
+    def _index(self) -> Iterator[sqlite3.Connection]:
+        with self._index_lock:
+            # a connection must not be shared with a forked process
+            if self._connection is None or self._connection_pid != os.getpid():
+                self.root.mkdir(parents=True, exist_ok=True)
+                connection = sqlite3.connect(
+                    self.root / "index.sqlite", timeout=30.0, check_same_thread=False
+                )
+                with connection:
+                    for statement in CREATE_INDEX:
+                        connection.execute(statement)
+                self._connection = connection
+                self._connection_pid = os.getpid()
+            with self._connection:
+                yield self._connection
+
+    def _pack_of(self, node_hash: str) -> Path | None:
+        with self._index() as index:
+            row = index.execute(
+                "SELECT pack FROM outputs WHERE hash = ?", (node_hash,)
+            ).fetchone()
+        return None if row is None else self.root / "packs" / row[0]
+
+    def _current_pack(self) -> Path:
+        packs_dir = self.root / "packs"
+        packs_dir.mkdir(parents=True, exist_ok=True)
+        packs = sorted(packs_dir.glob("pack-*.hdf5"))
+        if not packs:
+            return packs_dir / "pack-000000.hdf5"
+        if packs[-1].stat().st_size < self.pack_size:
+            return packs[-1]
+        number = int(packs[-1].stem.removeprefix("pack-")) + 1
+        return packs_dir / f"pack-{number:06d}.hdf5"
+
+
+OutputStore.default = OutputStore()
+
+
+def set_default_output_store(store: OutputStore) -> None:
+    """Set the store used for node outputs when no store is given."""
+    OutputStore.default = store
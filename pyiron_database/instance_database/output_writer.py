@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import contextlib
+import sys
+import threading
+from collections.abc import Callable, Mapping
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from types import TracebackType
+from typing import Any
+
+from pyiron_workflow.node import Node
+
+from pyiron_database.generic_storage import HDF5StoragePolicy
+
+from .node import get_hash, node_output_values
+from .output_store import OutputStore
+
+
+def estimate_nbytes(values: Mapping[str, Any]) -> int:
+    """A rough estimate of the memory held by output values."""
+    return sum(
+        getattr(value, "nbytes", None) or sys.getsizeof(value)
+        for value in values.values()
+    )
+
+
+class OutputWriter(contextlib.AbstractContextManager["OutputWriter"]):
+    """
+    Write node outputs in background threads.
+
+    :meth:`submit` takes a snapshot of a node's outputs, i.e. the output values at
+    the time of the call, and returns immediately with a future of the output
+    path. Values must not be changed in place until they are written. When the
+    snapshots waiting to be written exceed max_pending_bytes, submit blocks until
+    enough of them are written.
+
+    Args:
+        store (OutputStore | None): Where to write the outputs. Defaults to
+            :attr:`OutputStore.default`.
+        policy (HDF5StoragePolicy | None): Chunking and compression of the
+            outputs.
+        max_workers (int): The number of writing threads.
+        max_pending_bytes (int): The estimated size of the snapshots waiting to be
+            written above which submit blocks.
+    """
+
+    def __init__(
+        self,
+        store: OutputStore | None = None,
+        policy: HDF5StoragePolicy | None = None,
+        max_workers: int = 1,
+        max_pending_bytes: int = 1 << 30,
+    ) -> None:
+        self.store = store
+        self.policy = policy
+        self.max_pending_bytes = max_pending_bytes
+        self._executor = ThreadPoolExecutor(
+            max_workers, thread_name_prefix="OutputWriter"
+        )
+        self._condition = threading.Condition()
+        self._pending_bytes = 0
+        self._futures: list[Future[str]] = []
+
+    @property
+    def pending_bytes(self) -> int:
+        """The estimated size of the snapshots waiting to be written."""
+        return self._pending_bytes
+
+    def submit(
+        self,
+        node: Node,
+        hashes: dict[Node, str] | None = None,
+        on_written: Callable[[str], None] | None = None,
+    ) -> Future[str]:
+        """
+        Queue the outputs of a node to be written.
+
+        Args:
+            node (Node): The node whose outputs should be stored.
+            hashes (dict[Node, str] | None): hashes of already hashed nodes, see
+                :func:`get_hash`.
+            on_written (Callable[[str], None] | None): Called with the output path
+                in the writing thread once the outputs are written, e.g. to
+                reference them in a database. Its exceptions are set on the
+                future.
+
+        Returns:
+            Future[str]: The path the outputs are written to.
+        """
+        node_hash = get_hash(node, hashes)
+        values = node_output_values(node)
+        nbytes = estimate_nbytes(values)
+        with self._condition:
+            self._condition.wait_for(
+                lambda: (
+                    self._pending_bytes == 0
+                    or self._pending_bytes + nbytes <= self.max_pending_bytes
+                )
+            )
+            self._pending_bytes += nbytes
+            future = self._executor.submit(
+                self._write, node_hash, values, nbytes, on_written
+            )
+            self._futures.append(future)
+        return future
+
+    def _write(
+        self,
+        node_hash: str,
+        values: dict[str, Any],
+        nbytes: int,
+        on_written: Callable[[str], None] | None,
+    ) -> str:
+        try:
+            store = OutputStore.default if self.store is None else self.store
+            output_path = store.write(node_hash, values, self.policy)
+        finally:
+            with self._condition:
+                self._pending_bytes -= nbytes
+                self._condition.notify_all()
+        if on_written is not None:
+            on_written(output_path)
+        return output_path
+
+    def flush(self) -> None:
+        """
+        Wait until all outputs submitted since the last flush are written.
+
+        The first exception raised while writing them is raised again.
+        """
+        with self._condition:
+            futures, self._futures = self._futures, []
+        wait(futures)
+        for future in futures:
+            future.result()
+
+    def close(self) -> None:
+        """
+        Write all submitted outputs and stop the writing threads.
+
+        The first exception raised while writing is raised again.
+        """
+        try:
+            self.flush()
+        finally:
+            self._executor.shutdown(wait=True)
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
@@ -1,6 +1,13 @@
-from pyiron_database.obj_reconstruction.util import get_type, recreate_obj
+from pyiron_database.obj_reconstruction.util import (
+    TypeRegistry,
+    get_type,
+    recreate_obj,
+    type_registry,
+)
 
 __all__ = [
+    "TypeRegistry",
     "get_type",
     "recreate_obj",
+    "type_registry",
 ]
@@ -1,37 +1,99 @@
+import sys
+from importlib import import_module
 from typing import Any
 
+UNDEFINED_VERSION = "not_defined"
+
+
+class TypeRegistry:
+    """
+    Resolves the classes and caches the package versions used to store and
+    recreate objects.
+
+    Classes are looked up in their already imported module, so restoring many
+    objects does not go through the import machinery again, while a class which
+    is redefined, e.g. in a notebook, resolves to its current definition.
+    Qualnames may be dotted to reach nested classes. Versions are cached once per
+    base package. Classes which are not importable by their qualname can be
+    added with :meth:`register`, versions with :meth:`register_version`.
+    """
+
+    def __init__(self) -> None:
+        self._types: dict[tuple[str, str], Any] = {}
+        self._versions: dict[str, str] = {}
+
+    def register(
+        self, cls: Any, module: str | None = None, qualname: str | None = None
+    ) -> Any:
+        """
+        Register a class under its module and qualname, or the given ones.
+
+        Can be used as a class decorator.
+
+        Args:
+            cls (Any): The class.
+            module (str | None): The module to register the class under.
+            qualname (str | None): The qualname to register the class under.
+
+        Returns:
+            Any: The class.
+        """
+        module = cls.__module__ if module is None else module
+        qualname = cls.__qualname__ if qualname is None else qualname
+        self._types[module, qualname] = cls
+        return cls
+
+    def register_version(self, package: str, version: str) -> None:
+        """Register the version of a base package."""
+        self._versions[package] = version
+
+    def version(self, module_name: str) -> str:
+        """The version of the base package of a module."""
+        package = module_name.partition(".")[0]
+        try:
+            return self._versions[package]
+        except KeyError:
+            base_module = import_module(package)
+            version = getattr(base_module, "__version__", UNDEFINED_VERSION)
+            self._versions[package] = version
+            return version
+
+    def resolve(self, module_name: str, qualname: str) -> Any:
+        """The class with the given module and, possibly dotted, qualname."""
+        registered = self._types.get((module_name, qualname))
+        if registered is not None:
+            return registered
+        obj: Any = sys.modules.get(module_name)
+        if obj is None:
+            obj = import_module(module_name)
+        for name in qualname.split("."):
+            obj = getattr(obj, name)
+        return obj
+
+    def clear(self) -> None:
+        """Forget all registered classes and cached versions."""
+        self._types.clear()
+        self._versions.clear()
+
+
+type_registry = TypeRegistry()
+
 
 def get_type(cls: Any) -> tuple[str, str, str]:
     module = cls.__class__.__module__
     qualname = cls.__class__.__qualname__
-    from importlib import import_module
-
-    base_module = import_module(module.split(".")[0])
-    version = (
-        base_module.__version__
-        if hasattr(base_module, "__version__")
-        else "not_defined"
-    )
+    version = type_registry.version(module)
     return module, qualname, version
 
 
 def recreate_type(
     module_name: str, qualname: str, version: str, strict_version_check: bool = False
 ) -> Any:
-    from importlib import import_module
-
-    base_module = import_module(module_name.split(".")[0])
     if strict_version_check:
-        actual_version = (
-            base_module.__version__
-            if hasattr(base_module, "__version__")
-            else "not_defined"
-        )
+        actual_version = type_registry.version(module_name)
         if actual_version != version:
             raise ValueError(f"Version mismatch: {version} != {actual_version}")
-    module = import_module(module_name)
-    recreated_type = getattr(module, qualname)
-    return recreated_type
+    return type_registry.resolve(module_name, qualname)
 
 
 def recreate_obj(
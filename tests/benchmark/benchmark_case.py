@@ -0,0 +1,92 @@
+import json
+import os
+import platform
+import statistics
+import time
+import unittest
+from collections.abc import Callable
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+import pyiron_database
+
+RESULTS_FILE = os.environ.get(
+    "PYIRON_DATABASE_BENCHMARK_RESULTS", "benchmark_results.json"
+)
+
+
+def write_results(results: dict[str, dict[str, Any]], filename: str) -> None:
+    """Merge benchmark results into a JSON file, keeping results of other classes."""
+    path = Path(filename)
+    report = json.loads(path.read_text()) if path.exists() else {"benchmarks": {}}
+    report["metadata"] = {
+        "pyiron_database": pyiron_database.__version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+    }
+    report["benchmarks"].update(results)
+    path.write_text(json.dumps(report, indent=2, sort_keys=True))
+
+
+class BenchmarkCase(unittest.TestCase):
+    """
+    Test case which times operations and emits the timings as JSON.
+
+    The timings of all benchmark classes are merged into the file given by the
+    environment variable PYIRON_DATABASE_BENCHMARK_RESULTS (default
+    benchmark_results.json), so results can be compared across releases.
+    """
+
+    repeat: int = 5
+    results: dict[str, dict[str, Any]]
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.results = {}
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        if cls.results:
+            write_results(cls.results, RESULTS_FILE)
+
+    def benchmark(
+        self,
+        name: str,
+        func: Callable[[], Any],
+        setup: Callable[[], Any] | None = None,
+        repeat: int | None = None,
+    ) -> Any:
+        """
+        Time a function and record the result under the given name.
+
+        Args:
+            name (str): The name of the benchmark, e.g. "storage.hdf5.write.array".
+            func (Callable[[], Any]): The function to time.
+            setup (Callable[[], Any] | None): A function which is called untimed
+                before every repetition.
+            repeat (int | None): How often to time the function, defaults to
+                the repeat attribute of the class.
+
+        Returns:
+            Any: The return value of the last call of func.
+        """
+        timings = []
+        result = None
+        for _ in range(self.repeat if repeat is None else repeat):
+            if setup is not None:
+                setup()
+            start = time.perf_counter()
+            result = func()
+            timings.append(time.perf_counter() - start)
+
+        self.results[f"{type(self).__name__}.{name}"] = {
+            "min": min(timings),
+            "max": max(timings),
+            "mean": statistics.mean(timings),
+            "median": statistics.median(timings),
+            "repeat": len(timings),
+            "unit": "s",
+        }
+        return result
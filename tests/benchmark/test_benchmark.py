@@ -1,6 +0,0 @@
-import unittest
-
-
-class TestNothing(unittest.TestCase):
-    def test_nothing(self) -> None:
-        self.assertTrue(True)
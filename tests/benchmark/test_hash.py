@@ -0,0 +1,21 @@
+import unittest
+from functools import partial
+
+from pyiron_database.instance_database import get_hash
+
+from ..workflows import chain, diamonds
+from .benchmark_case import BenchmarkCase
+
+
+class TestHashBenchmark(BenchmarkCase):
+    def test_chain(self) -> None:
+        for length in (10, 100, 1000):
+            self.benchmark(f"chain.{length}", partial(get_hash, chain(length)))
+
+    def test_diamonds(self) -> None:
+        for count in (3, 30, 300):
+            self.benchmark(f"diamonds.{count}", partial(get_hash, diamonds(count)))
+
+
+if __name__ == "__main__":
+    unittest.main()
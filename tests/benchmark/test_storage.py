@@ -0,0 +1,79 @@
+import tempfile
+import unittest
+from dataclasses import dataclass
+from functools import partial
+from pathlib import Path
+
+import numpy as np
+
+from pyiron_database.generic_storage import HDF5Storage, JSONStorage, PickleStorage
+
+from .benchmark_case import BenchmarkCase
+
+
+@dataclass
+class Point:
+    x: float
+    y: float
+    label: str
+
+
+SAMPLES = {
+    "scalars": {f"value_{i}": float(i) for i in range(100)},
+    "wide_dict": {"wide": {f"value_{i}": float(i) for i in range(20_000)}},
+    "nested_dict": {"level_0": {f"key_{i}": {"a": i, "b": str(i)} for i in range(100)}},
+    "list": {"list": list(range(10_000))},
+    "dataclasses": {f"point_{i}": Point(i, -i, str(i)) for i in range(100)},
+    "array": {"array": np.random.default_rng(0).random(1_000_000)},
+}
+
+STORAGES = {
+    "hdf5": (HDF5Storage, "w", "r"),
+    "json": (JSONStorage, "w", "r"),
+    "pickle": (PickleStorage, "wb", "rb"),
+    "pickle_out_of_band": (partial(PickleStorage, out_of_band=True), "wb", "rb"),
+}
+
+
+class TestStorageBenchmark(BenchmarkCase):
+    repeat = 3
+
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def test_write_read(self) -> None:
+        for storage_name, (storage, write_mode, read_mode) in STORAGES.items():
+            for sample_name, sample in SAMPLES.items():
+                filename = str(
+                    Path(self.directory.name) / f"{sample_name}.{storage_name}"
+                )
+
+                def write(
+                    storage=storage,
+                    write_mode=write_mode,
+                    sample=sample,
+                    filename=filename,
+                ):
+                    with storage(filename, write_mode) as group:
+                        for key, value in sample.items():
+                            group[key] = value
+
+                def read(
+                    storage=storage,
+                    read_mode=read_mode,
+                    sample=sample,
+                    filename=filename,
+                ):
+                    with storage(filename, read_mode) as group:
+                        return {key: group[key] for key in sample}
+
+                with self.subTest(storage=storage_name, sample=sample_name):
+                    self.benchmark(f"{storage_name}.write.{sample_name}", write)
+                    self.benchmark(f"{storage_name}.read.{sample_name}", read)
+
+
+if __name__ == "__main__":
+    unittest.main()
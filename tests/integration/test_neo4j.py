@@ -0,0 +1,84 @@
+import unittest
+
+from pyiron_database.instance_database import (
+    Neo4jInstanceDatabase,
+    restore_nodes_from_database,
+    store_workflow_in_database,
+)
+
+from ..workflows import diamond
+
+
+class TestNeo4j(unittest.TestCase):
+    db: Neo4jInstanceDatabase
+
+    def setUp(self):
+        try:
+            self.db = Neo4jInstanceDatabase("bolt://neo4j:7687", ("neo4j", "pyiron"))
+        except ImportError as err:
+            raise unittest.SkipTest("Skipping due to import error.") from err
+        self.db.drop()
+        self.db.init()
+
+    def tearDown(self):
+        self.db.close()
+
+    def test_idempotence_of_drop_init(self):
+        self.db.drop()
+        self.db.drop()
+        self.db.init()
+        self.db.init()
+
+    def test_workflow_store(self) -> None:
+        wf = diamond()
+        hashes = store_workflow_in_database(self.db, wf)
+        self.assertEqual(len(self.db.read_many(list(hashes.values()))), 4)
+        self.assertEqual(
+            set(self.db.read_ancestors([hashes[wf.bottom]])), set(hashes.values())
+        )
+
+        nodes_restored = restore_nodes_from_database(self.db, [hashes[wf.bottom]])
+        node_restored = nodes_restored[hashes[wf.bottom]]
+        node_restored.run_data_tree()
+        node_restored.run()
+        self.assertEqual(node_restored.outputs.a.value, 8)
+
+    def test_update_delete(self) -> None:
+        hashes = store_workflow_in_database(self.db, diamond())
+        hash = next(iter(hashes.values()))
+
+        self.db.update(hash, output_path="dummy.hdf5")
+        self.assertEqual(getattr(self.db.read(hash), "output_path", None), "dummy.hdf5")
+        with self.assertRaises(KeyError):
+            self.db.update(hash, unknown="value")
+
+        self.db.delete(hash)
+        self.assertIsNone(self.db.read(hash))
+
+    def test_deduplicate(self) -> None:
+        wf = diamond()
+        hashes = store_workflow_in_database(self.db, wf)
+        top = hashes[wf.top]
+        with self.db.driver.session(database="neo4j") as session:
+            session.run("DROP CONSTRAINT node_hash_unique")
+            # what the MERGE on all properties of earlier versions created
+            session.run(
+                "MATCH (n :NODE {hash: $hash}) -[:OUTPUT]-> (o :OUTPUT) "
+                "CREATE (d :NODE) SET d = properties(n) "
+                "CREATE (d) -[:OUTPUT]-> (:OUTPUT {key: o.key})",
+                hash=top,
+            )
+
+        self.db.init()
+        with self.db.driver.session(database="neo4j") as session:
+            count = session.run(
+                "MATCH (n :NODE {hash: $hash}) RETURN count(n) AS count", hash=top
+            ).single()["count"]
+        self.assertEqual(count, 1)
+        self.assertEqual(
+            set(self.db.read_ancestors([hashes[wf.bottom]])), set(hashes.values())
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
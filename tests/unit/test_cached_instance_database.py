@@ -0,0 +1,146 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from pyiron_database.instance_database import (
+    CachedInstanceDatabase,
+    CachingExecutor,
+    OutputStore,
+    SQLiteInstanceDatabase,
+)
+from pyiron_database.instance_database.InstanceDatabase import InstanceDatabase
+
+from ..workflows import diamond
+
+
+class DictInstanceDatabase(InstanceDatabase):
+    def __init__(self) -> None:
+        self.nodes: dict[str, InstanceDatabase.NodeData] = {}
+        self.reads = 0
+
+    def init(self) -> None:
+        pass
+
+    def drop(self) -> None:
+        self.nodes.clear()
+
+    def create(self, node: InstanceDatabase.NodeData) -> str:
+        self.nodes.setdefault(node.hash, node)
+        return node.hash
+
+    def create_many(self, nodes: list[InstanceDatabase.NodeData]) -> list[str]:
+        return [self.create(node) for node in nodes]
+
+    def read(self, hash: str) -> InstanceDatabase.NodeData | None:
+        return self.read_many([hash]).get(hash)
+
+    def read_many(self, hashes: list[str]) -> dict[str, InstanceDatabase.NodeData]:
+        self.reads += 1
+        return {hash: self.nodes[hash] for hash in hashes if hash in self.nodes}
+
+    def update(self, hash: str, **kwargs) -> None:
+        for key, value in kwargs.items():
+            setattr(self.nodes[hash], key, value)
+
+    def delete(self, hash: str) -> None:
+        del self.nodes[hash]
+
+
+def node_data(
+    hash: str, input_hash: str | None = None, output_path: str | None = "outputs"
+) -> InstanceDatabase.NodeData:
+    inputs = {"x": "1"} if input_hash is None else {"x": f"{input_hash}@a"}
+    return InstanceDatabase.NodeData(
+        hash=hash,
+        qualname="AddNode",
+        module="test",
+        version="not_defined",
+        connected_inputs=[] if input_hash is None else ["x"],
+        inputs=inputs,
+        outputs=["a"],
+        output_path=output_path,
+    )
+
+
+class TestCachedInstanceDatabase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.backend = DictInstanceDatabase()
+        self.db = CachedInstanceDatabase(self.backend, max_entries=2)
+        self.db.create_many([node_data("a"), node_data("b", "a"), node_data("c", "b")])
+
+    def test_read(self) -> None:
+        self.assertEqual(self.db.read("a"), node_data("a"))
+        self.assertEqual(self.db.read("a"), node_data("a"))
+        self.assertEqual(self.backend.reads, 1)
+        self.assertEqual(self.db.hit_ratio, 0.5)
+
+    def test_copies(self) -> None:
+        self.db.read("a").inputs["x"] = "2"  # type: ignore[union-attr]
+        self.assertEqual(self.db.read("a"), node_data("a"))
+        self.assertEqual(self.backend.nodes["a"], node_data("a"))
+
+    def test_incomplete(self) -> None:
+        self.db.create(node_data("d", output_path=None))
+        self.assertIsNone(getattr(self.db.read("d"), "output_path", None))
+        # e.g. set by another worker
+        self.backend.update("d", output_path="d.hdf5")
+        self.assertEqual(getattr(self.db.read("d"), "output_path", None), "d.hdf5")
+        self.assertEqual(self.backend.reads, 2)
+
+    def test_negative_cache(self) -> None:
+        self.assertIsNone(self.db.read("d"))
+        self.assertIsNone(self.db.read("d"))
+        self.assertEqual(self.backend.reads, 2)
+
+        self.db = CachedInstanceDatabase(self.backend, negative_ttl=1.0)
+        self.assertIsNone(self.db.read("d"))
+        self.assertIsNone(self.db.read("d"))
+        self.assertEqual(self.backend.reads, 3)
+
+        self.db.create(node_data("d"))
+        self.assertIsNotNone(self.db.read("d"))
+
+    def test_eviction(self) -> None:
+        self.db.read_many(["a", "b", "c"])
+        self.assertEqual(len(self.db._records), 2)
+        self.db.read("c")
+        self.assertEqual(self.backend.reads, 1)
+        self.db.read("a")
+        self.assertEqual(self.backend.reads, 2)
+
+    def test_invalidation(self) -> None:
+        self.db.read("a")
+        self.db.update("a", output_path="a.hdf5")
+        self.assertEqual(getattr(self.db.read("a"), "output_path", None), "a.hdf5")
+        self.db.delete("a")
+        self.assertIsNone(self.db.read("a"))
+
+    def test_read_ancestors(self) -> None:
+        self.db = CachedInstanceDatabase(self.backend)
+        self.assertEqual(set(self.db.read_ancestors(["c"])), {"a", "b", "c"})
+        reads = self.backend.reads
+        self.assertEqual(set(self.db.read_ancestors(["c"])), {"a", "b", "c"})
+        self.assertEqual(self.backend.reads, reads)
+
+
+class TestCachingExecutor(unittest.TestCase):
+    def test_cached_records(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            backend = SQLiteInstanceDatabase(str(Path(directory) / "nodes.db"))
+            backend.init()
+            db = CachedInstanceDatabase(backend)
+            executor = CachingExecutor(
+                db, marker_dir=directory, output_store=OutputStore(directory)
+            )
+            for _ in range(3):
+                wf = diamond()
+                executor.run_workflow(wf)
+                self.assertEqual(wf.bottom.outputs.a.value, 8)
+            self.assertEqual((executor.hits, executor.misses), (8, 4))
+            # the second run completes the records, the third reads them cached
+            self.assertEqual(db.hits, 4)
+            backend.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
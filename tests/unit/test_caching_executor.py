@@ -0,0 +1,127 @@
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+from pyiron_workflow import Workflow
+
+from pyiron_database.instance_database import (
+    CachingExecutor,
+    HashIndex,
+    OutputStore,
+    OutputWriter,
+    SQLiteInstanceDatabase,
+    get_hash,
+)
+
+from ..workflows import AddNode, diamond
+
+
+@Workflow.wrap.as_function_node()
+def Slow(x: int = 1, delay: float = 0.5) -> int:
+    time.sleep(delay)
+    y = x
+    return y
+
+
+def dead_pid() -> int:
+    process = subprocess.Popen([sys.executable, "-c", ""])
+    process.wait()
+    return process.pid
+
+
+class TestCachingExecutor(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.root = Path(self.directory.name)
+        self.store = OutputStore(str(self.root / "outputs"))
+        self.db = SQLiteInstanceDatabase(str(self.root / "nodes.db"))
+        self.db.init()
+
+    def tearDown(self) -> None:
+        self.db.close()
+        self.directory.cleanup()
+
+    def executor(self, db: SQLiteInstanceDatabase | None = None) -> CachingExecutor:
+        return CachingExecutor(
+            self.db if db is None else db,
+            marker_dir=str(self.root),
+            poll_interval=0.01,
+            output_store=self.store,
+        )
+
+    def test_output_writer(self) -> None:
+        with OutputWriter(self.store) as writer:
+            executor = CachingExecutor(
+                self.db, marker_dir=str(self.root), output_writer=writer
+            )
+            wf = diamond()
+            executor.run_workflow(wf)
+        self.assertEqual(list(self.root.glob("*.in_progress")), [])
+
+        executor = self.executor()
+        wf = diamond()
+        executor.run_workflow(wf, HashIndex(wf))
+        self.assertEqual(executor.hits, 4)
+        self.assertEqual(wf.bottom.outputs.a.value, 8)
+
+    def test_concurrent_workers(self) -> None:
+        executors = []
+        nodes = []
+
+        def work() -> None:
+            db = SQLiteInstanceDatabase(str(self.root / "nodes.db"))
+            executors.append(self.executor(db))
+            nodes.append(Slow(3))
+            executors[-1].run(nodes[-1])
+            db.close()
+
+        threads = [threading.Thread(target=work) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(sum(executor.misses for executor in executors), 1)
+        self.assertEqual(sum(executor.hits for executor in executors), 1)
+        self.assertEqual([node.outputs.y.value for node in nodes], [3, 3])
+        self.assertEqual(list(self.root.glob("*.in_progress*")), [])
+
+    def test_orphaned_marker(self) -> None:
+        node = AddNode(3, 4)
+        marker = self.root / f"{get_hash(node)}.in_progress"
+        marker.write_text(f"{socket.gethostname()} {dead_pid()}")
+
+        self.assertFalse(self.executor().run(node))
+        self.assertEqual(node.outputs.a.value, 7)
+        self.assertFalse(marker.exists())
+
+    def test_replaced_marker(self) -> None:
+        node = AddNode(3, 4)
+        marker = self.root / f"{get_hash(node)}.in_progress"
+        marker.write_text(f"{socket.gethostname()} {dead_pid()}")
+        executor = self.executor()
+        is_abandoned = executor._is_abandoned
+        live = f"{socket.gethostname()} {os.getpid()}"
+
+        def replace_after_check(path: Path) -> bool:
+            abandoned = is_abandoned(path)
+            # another worker removes the abandoned marker and creates its own
+            replacement = marker.with_name("replacement")
+            replacement.write_text(live)
+            os.replace(replacement, marker)
+            return abandoned
+
+        executor._is_abandoned = replace_after_check  # type: ignore[method-assign, assignment]
+        self.assertFalse(executor._mark_in_progress(get_hash(node)))
+        self.assertEqual(marker.read_text(), live)
+        self.assertEqual(list(self.root.glob("*.in_progress*")), [marker])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,9 +1,21 @@
 import unittest
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from pathlib import Path
 
+import h5py
+import numpy as np
 from pyiron_workflow import NOT_DATA
 
-from pyiron_database.generic_storage import HDF5Storage, JSONStorage, PickleStorage
+from pyiron_database.generic_storage import (
+    CodecRegistry,
+    HDF5Storage,
+    HDF5StoragePolicy,
+    IndexedFile,
+    JSONStorage,
+    LazyDataset,
+    PickleStorage,
+    StorageGroup,
+)
 
 
 @dataclass
@@ -18,6 +30,84 @@ class Rectangle:
     lower_right_corner: Point
 
 
+@dataclass(frozen=True)
+class Interval:
+    lower: float
+    upper: float
+
+
+@dataclass
+class Circle:
+    radius: float
+    area: float = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.area = 3.0 * self.radius**2
+        self.label = "circle"
+
+
+class Celsius:
+    def __init__(self, degrees: float) -> None:
+        self.degrees = degrees
+
+
+STORAGES = (
+    (HDF5Storage, "dummy.hdf5", "w", "r"),
+    (JSONStorage, "dummy.json", "w", "r"),
+    (PickleStorage, "dummy.pickle", "wb", "rb"),
+)
+
+
+class TestCodecs(unittest.TestCase):
+    def setUp(self) -> None:
+        self.codecs = StorageGroup.codecs
+        StorageGroup.codecs = CodecRegistry()
+
+    def tearDown(self) -> None:
+        StorageGroup.codecs = self.codecs
+
+    def test_dataclass(self) -> None:
+        codecs = StorageGroup.codecs
+        self.assertTrue(codecs.is_dataclass(Interval))
+        self.assertIs(codecs.encoder(Interval), codecs.encoder(Interval))
+        for storage, filename, write_mode, read_mode in STORAGES[:2]:
+            with self.subTest(storage=storage.__name__):
+                with storage(filename, write_mode) as group:
+                    group["interval"] = Interval(1.0, 2.0)
+                with storage(filename, read_mode) as group:
+                    self.assertEqual(group["interval"], Interval(1.0, 2.0))
+
+    def test_dataclass_extra_attributes(self) -> None:
+        circle = Circle(2.0)
+        circle.note = "extra"  # type: ignore[attr-defined]
+        for storage, filename, write_mode, read_mode in STORAGES:
+            with self.subTest(storage=storage.__name__):
+                with storage(filename, write_mode) as group:
+                    group["circle"] = circle
+                with storage(filename, read_mode) as group:
+                    self.assertEqual(vars(group["circle"]), vars(circle))
+        with HDF5Storage("dummy.hdf5", "w") as group:
+            group["circles"] = [circle, Circle(1.0)]
+        with HDF5Storage("dummy.hdf5", "r") as group:
+            self.assertEqual(
+                [vars(c) for c in group["circles"]], [vars(circle), vars(Circle(1.0))]
+            )
+
+    def test_custom(self) -> None:
+        StorageGroup.codecs.register(
+            Celsius,
+            "celsius",
+            lambda group, value: group.update(degrees=value.degrees),
+            lambda group: Celsius(group["degrees"] + 0.5),
+        )
+        for storage, filename, write_mode, read_mode in STORAGES:
+            with self.subTest(storage=storage.__name__):
+                with storage(filename, write_mode) as group:
+                    group["temperature"] = Celsius(20.0)
+                with storage(filename, read_mode) as group:
+                    self.assertEqual(group["temperature"].degrees, 20.5)
+
+
 class TestDataIO(unittest.TestCase):
     def store(self, group) -> None:
         group["int"] = 1
@@ -58,12 +148,194 @@ class TestDataIO(unittest.TestCase):
         with HDF5Storage("dummy.hdf5", "r") as group:
             self.check(group)
 
+    def test_hdf5_homogeneous_sequences(self) -> None:
+        values = {
+            "ints": list(range(1000)),
+            "floats": (1.5, 2.5),
+            "strings": ["a", "bc"],
+            "bools": [True, False],
+            "empty": [],
+            "mixed": [1, "a"],
+        }
+        with HDF5Storage("dummy.hdf5", "w") as group:
+            group.update(values)
+            self.assertFalse(group.is_group("ints"))
+            self.assertTrue(group.is_group("mixed"))
+        with HDF5Storage("dummy.hdf5", "r") as group:
+            for key, value in values.items():
+                self.assertEqual(group[key], value)
+                self.assertIs(type(group[key]), type(value))
+
+    def test_hdf5_columns(self) -> None:
+        values = {
+            "points": [Point(i, -i) for i in range(1000)],
+            "intervals": [Interval(0.0, 1.5), Interval(2.0, 3.5)],
+            "records": [{"name": "a", "value": 1.0}, {"name": "b", "value": 2.0}],
+            "keyless": [{}, {}],
+            "mixed": [Point(1, 2), {"x": 1, "y": 2}],
+            "nested": [Rectangle(Point(1, 2), Point(3, 4))],
+        }
+        with HDF5Storage("dummy.hdf5", "w") as group:
+            group.update(values)
+        with h5py.File("dummy.hdf5", "r") as file:
+            self.assertEqual(file["points"].attrs["_type"], "columns")
+            self.assertEqual(file["points/x"].shape, (1000,))
+            self.assertEqual(file["mixed"].attrs["_type"], "list")
+            self.assertEqual(file["nested"].attrs["_type"], "list")
+        with HDF5Storage("dummy.hdf5", "r") as group:
+            for key, value in values.items():
+                self.assertEqual(group[key], value)
+            self.assertIs(type(group["points"][0].x), int)
+
+    def test_hdf5_policy(self) -> None:
+        policy = HDF5StoragePolicy(
+            compression="gzip",
+            shuffle=True,
+            min_size=1024,
+            chunk_size=8 * 1024,
+            outputs={"raw": HDF5StoragePolicy()},
+        )
+        large = np.zeros((1000, 4))
+        with HDF5Storage("dummy.hdf5", "w", policy) as group:
+            group["large"] = large
+            group["small"] = np.zeros(10)
+            group["raw"] = large
+            group["nested"] = {"large": large}
+        with HDF5Storage("dummy.hdf5", "r") as group:
+            dataset = group.data["large"]
+            self.assertEqual(dataset.compression, "gzip")
+            self.assertTrue(dataset.shuffle)
+            self.assertEqual(dataset.chunks, (256, 4))
+            self.assertEqual(group.data["nested/large"].compression, "gzip")
+            self.assertIsNone(group.data["small"].chunks)
+            self.assertIsNone(group.data["raw"].chunks)
+            np.testing.assert_array_equal(group["large"], large)
+
+    def test_hdf5_compact_layout(self) -> None:
+        with HDF5Storage("dummy.hdf5", "w") as group:
+            self.store(group)
+            group["type"] = Point
+        with h5py.File("dummy.hdf5", "r") as file:
+            self.assertEqual(set(file), {"rect", "NOT_DATA", "list", "np"})
+            self.assertEqual(file["rect"].attrs["_type"], "dataclass")
+            self.assertIn("_class", file["rect"].attrs)
+            self.assertEqual(file["rect/upper_left_corner"].attrs["x"], 1)
+        with HDF5Storage("dummy.hdf5", "r") as group:
+            self.check(group)
+            self.assertIs(group["type"], Point)
+
+    def test_hdf5_legacy_layout(self) -> None:
+        with h5py.File("dummy.hdf5", "w") as file:
+            file["int"] = 1
+            file["string"] = "1"
+            file.create_group("None")["_type"] = "None"
+            point_type = file.create_group("type")
+            point_type["_type"] = "type"
+            point_type["_class"] = f"{__name__}@Point@not_defined"
+        with HDF5Storage("dummy.hdf5", "r") as group:
+            self.assertEqual(group["int"], 1)
+            self.assertEqual(group["string"], "1")
+            self.assertIsNone(group["None"])
+            self.assertIs(group["type"], Point)
+
+    def test_hdf5_lazy(self) -> None:
+        array = np.arange(100_000, dtype=float).reshape(-1, 10)
+        policy = HDF5StoragePolicy(outputs={"chunked": HDF5StoragePolicy("gzip")})
+        with HDF5Storage("dummy.hdf5", "w", policy) as group:
+            group["contiguous"] = array
+            group["chunked"] = array
+            group["list"] = [1, 2, 3]
+        with HDF5Storage("dummy.hdf5", "r", lazy=True) as group:
+            contiguous = group["contiguous"]
+            chunked = group["chunked"]
+            self.assertEqual(group["list"], [1, 2, 3])
+        self.assertIsInstance(contiguous, np.memmap)
+        self.assertFalse(contiguous.flags.writeable)
+        np.testing.assert_array_equal(contiguous, array)
+        self.assertIsInstance(chunked, LazyDataset)
+        self.assertEqual(chunked.shape, array.shape)
+        np.testing.assert_array_equal(chunked[5:7, 2], array[5:7, 2])
+        np.testing.assert_array_equal(np.asarray(chunked), array)
+
     def test_pickle_io(self) -> None:
         with PickleStorage("dummy.pickle", "wb") as group:
             self.store(group)
         with PickleStorage("dummy.pickle", "rb") as group:
             self.check(group)
 
+    def test_pickle_out_of_band(self) -> None:
+        large = np.arange(100_000, dtype=float)
+        with PickleStorage("dummy.pickle", "wb", out_of_band=True) as group:
+            self.store(group)
+            group["large"] = large
+            group["large_int"] = np.arange(50_000)
+        with PickleStorage("dummy.pickle", "rb") as group:
+            self.check(group)
+            restored = group["large"]
+            np.testing.assert_array_equal(restored, large)
+            np.testing.assert_array_equal(group["large_int"], np.arange(50_000))
+            self.assertFalse(restored.flags.writeable)
+            self.assertEqual(restored.__array_interface__["data"][0] % 64, 0)
+            self.assertTrue(group["np"].flags.writeable)
+
+    def test_indexed_io(self) -> None:
+        for storage, filename, write_mode, read_mode in (
+            (JSONStorage, "dummy.json", "w", "r"),
+            (PickleStorage, "dummy.pickle", "wb", "rb"),
+        ):
+            with self.subTest(storage=storage.__name__):
+                with storage(filename, write_mode, indexed=True) as group:
+                    self.store(group)
+                    group["large"] = list(range(1000))
+                with storage(filename, read_mode) as group:
+                    self.check(group)
+                size = Path(filename).stat().st_size
+
+                update_mode = write_mode.replace("w", "a")
+                with storage(filename, update_mode) as group:
+                    self.assertEqual(group["rect"].upper_left_corner.x, 1)
+                self.assertEqual(Path(filename).stat().st_size, size)
+                with storage(filename, update_mode) as group:
+                    group["int"] = 2
+                    del group["string"]
+                    group.create_group("new")["x"] = 1
+                self.assertLess(Path(filename).stat().st_size, 2 * size)
+                with storage(filename, read_mode) as group:
+                    self.assertEqual(group["int"], 2)
+                    self.assertNotIn("string", group)
+                    self.assertEqual(group["new"]["x"], 1)
+                    self.assertEqual(group["large"], list(range(1000)))
+
+    def test_indexed_compaction(self) -> None:
+        for storage, filename, write_mode, read_mode in (
+            (JSONStorage, "dummy.json", "w", "r"),
+            (PickleStorage, "dummy.pickle", "wb", "rb"),
+        ):
+            with self.subTest(storage=storage.__name__):
+                with storage(filename, write_mode, indexed=True) as group:
+                    self.store(group)
+                    group["large"] = list(range(1000))
+                size = Path(filename).stat().st_size
+
+                update_mode = write_mode.replace("w", "a")
+                for i in range(20):
+                    with storage(filename, update_mode) as group:
+                        group["large"] = list(range(i, 1000 + i))
+                    self.assertLess(Path(filename).stat().st_size, 3 * size)
+                with storage(filename, read_mode) as group:
+                    self.check(group)
+                    self.assertEqual(group["large"], list(range(19, 1019)))
+
+                with storage(filename, update_mode) as group:
+                    del group["large"]
+                    assert isinstance(group.data, IndexedFile)
+                    group.data.compact()
+                    self.assertEqual(group["int"], 1)
+                self.assertLess(Path(filename).stat().st_size, size / 2)
+                with storage(filename, read_mode) as group:
+                    self.check(group)
+                    self.assertNotIn("large", group)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,119 @@
+import hashlib
+import json
+import unittest
+from dataclasses import dataclass
+
+import numpy as np
+from pyiron_workflow import Workflow
+
+from pyiron_database.instance_database import (
+    HashIndex,
+    get_hash,
+    hash_value,
+    hash_workflow,
+    set_default_hash_algorithm,
+)
+from pyiron_database.instance_database.node import node_to_jsongroup
+
+from ..workflows import AddNode, diamond
+
+
+@Workflow.wrap.as_function_node()
+def Total(values):
+    total = sum(values)
+    return total
+
+
+@dataclass
+class Point:
+    x: int
+    y: int
+
+
+class TestHash(unittest.TestCase):
+    def test_hash_workflow(self) -> None:
+        wf = diamond()
+
+        hashes = hash_workflow(wf)
+
+        self.assertEqual(len(hashes), 4)
+        for node in wf.children.values():
+            self.assertEqual(hashes[node], get_hash(node))
+        self.assertEqual(len(set(hashes.values())), 4)
+
+    def test_hash_long_chain(self) -> None:
+        nodes = [AddNode(1, 2)]
+        for _ in range(1500):
+            nodes.append(AddNode(nodes[-1].outputs.a, 1))
+
+        self.assertEqual(len(get_hash(nodes[-1])), 64)
+
+    def test_hash_index(self) -> None:
+        wf = diamond()
+        index = HashIndex(wf)
+        self.assertEqual(index.update(), hash_workflow(wf))
+        self.assertEqual(index.rehashed, 4)
+
+        index.update()
+        self.assertEqual(index.rehashed, 0)
+
+        wf.left.inputs.y = 4
+        self.assertEqual(index.update(), hash_workflow(wf))
+        self.assertEqual(index.rehashed, 2)
+
+        # the hash does not change, so nothing downstream is rehashed
+        index.invalidate(wf.top)
+        index.update()
+        self.assertEqual(index.rehashed, 1)
+
+        wf.right.inputs.x = wf.top.outputs.a
+        wf.extra = AddNode(wf.bottom.outputs.b, 1)
+        self.assertEqual(index.update(), hash_workflow(wf))
+        self.assertEqual(index.rehashed, 3)
+
+    def test_hash_value_json(self) -> None:
+        value = {
+            "b": [1, 2.5, None, True, "\u00e4\n", float("nan"), -float("inf")],
+            "a": {"z": 1e300, "y": -0.0, "x": {}},
+        }
+        expected = hashlib.sha256(json.dumps(value, sort_keys=True).encode())
+        self.assertEqual(hash_value(value), expected.hexdigest())
+
+    def test_hash_value_arrays(self) -> None:
+        array = np.arange(12.0).reshape(3, 4)
+        self.assertEqual(hash_value(array), hash_value(array.copy()))
+        self.assertEqual(hash_value(array.T), hash_value(array.T.copy()))
+        self.assertNotEqual(hash_value(array), hash_value(array.reshape(4, 3)))
+        self.assertNotEqual(hash_value(array), hash_value(array.astype(np.float32)))
+        self.assertNotEqual(hash_value([1, 2]), hash_value((1, 2)))
+        self.assertNotEqual(hash_value(Point(1, 2)), hash_value({"x": 1, "y": 2}))
+        point = Point(1, 2)
+        point.label = "a"  # type: ignore[attr-defined]
+        self.assertNotEqual(hash_value(point), hash_value(Point(1, 2)))
+        self.assertTrue(hash_value(array, "blake2b").startswith("blake2b-"))
+        with self.assertRaises(ValueError):
+            set_default_hash_algorithm("shake_128")
+
+    def test_hash_value_structured_arrays(self) -> None:
+        data = np.zeros(2, dtype=[("a", "<f8"), ("b", "<f8")])
+        renamed = data.view([("x", "<f8"), ("y", "<f8")])
+        nested = data.view([("a", "<f8", (2,))])
+        self.assertEqual(data.dtype.str, renamed.dtype.str)
+        self.assertNotEqual(hash_value(data), hash_value(renamed))
+        self.assertNotEqual(hash_value(data), hash_value(nested))
+        self.assertEqual(hash_value(data), hash_value(data.copy()))
+
+    def test_hash_jsongroup(self) -> None:
+        for value in [(1, 2), b"data", np.arange(3), np.int64(3), Point(1, 2)]:
+            with self.subTest(value=value):
+                node = Total(value)
+                self.assertEqual(get_hash(node), get_hash(node_to_jsongroup(node)))
+
+    def test_hash_array_inputs(self) -> None:
+        node = Total([np.arange(10), np.int64(3)])
+        self.assertEqual(get_hash(node), get_hash(Total([np.arange(10), np.int64(3)])))
+        self.assertNotEqual(get_hash(node), get_hash(Total([np.arange(10), 4])))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,130 @@
+import unittest
+from unittest import mock
+
+from pyiron_database.instance_database.InstanceDatabase import InstanceDatabase
+from pyiron_database.instance_database.Neo4jInstanceDatabase import (
+    CREATE_QUERY,
+    DELETE_QUERY,
+    UPDATE_QUERY,
+    Neo4jInstanceDatabase,
+    node_parameters,
+    node_properties,
+    record_to_node_data,
+)
+
+
+def node_data(hash: str, input_hash: str | None = None) -> InstanceDatabase.NodeData:
+    inputs = {"x": "1"} if input_hash is None else {"x": f"{input_hash}@a"}
+    return InstanceDatabase.NodeData(
+        hash=hash,
+        qualname="AddNode",
+        module="test",
+        version="not_defined",
+        connected_inputs=[] if input_hash is None else ["x"],
+        inputs={**inputs, "y": "2"},
+        outputs=["a", "b"],
+        output_path=f"{hash}.hdf5",
+    )
+
+
+def read_record(parameters: dict) -> dict:
+    """The record the read query returns for a node created from parameters."""
+    return {
+        "n": {
+            key: parameters[key]
+            for key in ("hash", "name", "module", "version", "output_path")
+        },
+        "inputs": parameters["inp"],
+        "outputs": [output["key"] for output in parameters["out"]],
+    }
+
+
+class TestNeo4jInstanceDatabase(unittest.TestCase):
+    def test_node_parameters(self) -> None:
+        nodes = [node_data("a"), node_data("b", "a"), node_data("a")]
+        parameters = node_parameters(nodes)
+        self.assertEqual([p["hash"] for p in parameters], ["a", "b"])
+        self.assertEqual(parameters[0]["channels"], [])
+        self.assertEqual(
+            parameters[1]["channels"],
+            [{"input_channel": "x", "output_hash": "a", "output_channel": "a"}],
+        )
+        self.assertEqual(parameters[1]["name"], "AddNode")
+
+        nodes[0].output_path = None
+        self.assertEqual(node_parameters(nodes[:1])[0]["output_path"], "")
+
+    def test_record_to_node_data(self) -> None:
+        nodes = [node_data("a"), node_data("b", "a")]
+        for node, parameters in zip(nodes, node_parameters(nodes), strict=True):
+            with self.subTest(hash=node.hash):
+                self.assertEqual(record_to_node_data(read_record(parameters)), node)
+
+        # every output is listed once, even if it is matched more than once
+        record = read_record(node_parameters(nodes[:1])[0])
+        record["outputs"] += record["outputs"]
+        self.assertEqual(record_to_node_data(record).outputs, ["a", "b"])
+
+    def test_node_properties(self) -> None:
+        self.assertDictEqual(
+            node_properties({"output_path": "outputs.hdf5", "qualname": "Add"}),
+            {"output_path": "outputs.hdf5", "name": "Add"},
+        )
+        self.assertDictEqual(
+            node_properties({"output_path": None}), {"output_path": ""}
+        )
+        with self.assertRaises(KeyError):
+            node_properties({"inputs": {}})
+
+
+class TestNeo4jStatements(unittest.TestCase):
+    def setUp(self) -> None:
+        # the statements are checked without a server or driver
+        self.db = object.__new__(Neo4jInstanceDatabase)
+        self.db.driver = mock.MagicMock()
+        self.session = self.db.driver.session.return_value.__enter__.return_value
+
+    def test_create_many(self) -> None:
+        self.db.batch_size = 2
+        nodes = [node_data("a")] + [node_data(f"{i}", "a") for i in range(4)]
+        self.assertEqual(self.db.create_many(nodes), [node.hash for node in nodes])
+
+        (create_nodes,), kwargs = self.session.execute_write.call_args
+        tx = mock.MagicMock()
+        create_nodes(tx, **kwargs)
+        batches = [call.kwargs["nodes"] for call in tx.run.call_args_list]
+        self.assertEqual(
+            {call.args for call in tx.run.call_args_list}, {(CREATE_QUERY,)}
+        )
+        self.assertEqual([len(batch) for batch in batches], [2, 2, 1])
+        self.assertEqual(
+            [p["hash"] for batch in batches for p in batch], ["a", "0", "1", "2", "3"]
+        )
+
+    def test_update(self) -> None:
+        node = node_data("a")
+        self.db.update("a", output_path="other.hdf5", version="1.0")
+        self.session.run.assert_called_once_with(
+            UPDATE_QUERY,
+            hash="a",
+            properties={"output_path": "other.hdf5", "version": "1.0"},
+        )
+
+        # what SET n += $properties does to the node read back
+        record = read_record(node_parameters([node])[0])
+        record["n"].update(self.session.run.call_args.kwargs["properties"])
+        updated = record_to_node_data(record)
+        self.assertEqual((updated.output_path, updated.version), ("other.hdf5", "1.0"))
+        self.assertEqual(updated.inputs, node.inputs)
+
+        with self.assertRaises(KeyError):
+            self.db.update("a", outputs=["c"])
+        self.assertEqual(self.session.run.call_count, 1)
+
+    def test_delete(self) -> None:
+        self.db.delete("a")
+        self.session.run.assert_called_once_with(DELETE_QUERY, hash="a")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,139 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+import h5py
+import numpy as np
+
+from pyiron_database.instance_database import (
+    OutputStore,
+    get_hash,
+    restore_node_outputs,
+    store_node_outputs,
+)
+
+from ..workflows import AddNode
+
+
+class TestOutputStore(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.root = Path(self.directory.name)
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def test_sharded(self) -> None:
+        store = OutputStore(str(self.root), shard_depth=2)
+        node_hash = "abcdef"
+        self.assertFalse(store.exists(node_hash))
+        path = store.write(node_hash, {"x": 1, "array": np.arange(3)})
+        self.assertEqual(Path(path), self.root / "ab" / "cd" / "abcdef.hdf5")
+        self.assertTrue(store.exists(node_hash))
+        with store.open(node_hash) as outputs:
+            self.assertEqual(outputs["x"], 1)
+            self.assertListEqual(outputs["array"].tolist(), [0, 1, 2])
+        with self.assertRaises(FileNotFoundError), store.open("missing"):
+            pass
+        self.assertEqual(
+            store.path("blake2b-abcdef"),
+            self.root / "ab" / "cd" / "blake2b-abcdef.hdf5",
+        )
+
+    def test_pack(self) -> None:
+        store = OutputStore(str(self.root), pack=True, pack_size=1)
+        for i in range(3):
+            store.write(f"hash{i}", {"x": i, "array": np.full(1000, i)})
+        store.write("hash1", {"x": 10})
+        self.assertEqual(len(list((self.root / "packs").iterdir())), 4)
+        for i, x in enumerate([0, 10, 2]):
+            with store.open(f"hash{i}", lazy=True) as outputs:
+                self.assertEqual(outputs["x"], x)
+                if i != 1:
+                    self.assertEqual(outputs["array"][-1], i)
+        self.assertFalse(store.exists("hash3"))
+
+    def test_pack_superseded(self) -> None:
+        store = OutputStore(str(self.root), pack=True, pack_size=1)
+        store.write("hash0", {"array": np.zeros(100_000)})
+        store.write("hash1", {"x": 1})
+        store.write("hash0", {"x": 0})
+        first = self.root / "packs" / "pack-000000.hdf5"
+        with h5py.File(first, "r") as file:
+            self.assertNotIn("hash0", file)
+
+        size = first.stat().st_size
+        store.compact()
+        self.assertLess(first.stat().st_size, size)
+        with store.open("hash0") as outputs:
+            self.assertEqual(outputs["x"], 0)
+        with store.open("hash1") as outputs:
+            self.assertEqual(outputs["x"], 1)
+
+    def test_dedup(self) -> None:
+        for pack in (False, True):
+            with self.subTest(pack=pack):
+                root = self.root / str(pack)
+                store = OutputStore(str(root), pack=pack, dedup_min_size=1024)
+                shared = np.arange(1000.0)
+                store.write("hash0", {"array": shared, "small": np.zeros(2)})
+                store.write("hash1", {"array": shared.copy()})
+                store.write("hash2", {"array": -shared})
+                self.assertEqual(len(list(root.glob("blobs/*/*.hdf5"))), 2)
+                with store.open("hash1", lazy=True) as outputs:
+                    np.testing.assert_array_equal(outputs["array"], shared)
+                store.write("hash2", {"array": shared})
+                self.assertEqual(len(list(root.glob("blobs/*/*.hdf5"))), 1)
+                store.delete("hash0")
+                self.assertFalse(store.exists("hash0"))
+                self.assertEqual(len(list(root.glob("blobs/*/*.hdf5"))), 1)
+                store.delete("hash1")
+                store.delete("hash2")
+                self.assertEqual(len(list(root.glob("blobs/*/*.hdf5"))), 0)
+
+    def test_dedup_concurrent_delete(self) -> None:
+        store = OutputStore(str(self.root), dedup_min_size=1024)
+        # another process sharing the root
+        other = OutputStore(str(self.root), dedup_min_size=1024)
+        shared = np.arange(1000.0)
+        store.write("hash0", {"array": shared})
+
+        link_blobs = store._link_blobs
+
+        def delete_then_link(*args, **kwargs):
+            other.delete("hash0")
+            link_blobs(*args, **kwargs)
+
+        store._link_blobs = delete_then_link  # type: ignore[method-assign]
+        store.write("hash1", {"array": shared})
+        with store.open("hash1") as outputs:
+            np.testing.assert_array_equal(outputs["array"], shared)
+
+    def test_rewrite_lazy(self) -> None:
+        for pack in (False, True):
+            with self.subTest(pack=pack):
+                store = OutputStore(str(self.root / str(pack)), pack=pack)
+                array = np.arange(1_000_000.0)
+                store.write("hash0", {"array": array})
+                with store.open("hash0", lazy=True) as outputs:
+                    lazy = outputs["array"]
+                self.assertIsInstance(lazy, np.memmap)
+                store.write("hash0", {"array": lazy})
+                with store.open("hash0") as outputs:
+                    np.testing.assert_array_equal(outputs["array"], array)
+
+    def test_node_outputs(self) -> None:
+        store = OutputStore(str(self.root), pack=True)
+        node = AddNode(3, 4)
+        node.run()
+        store_node_outputs(node, store=store)
+        self.assertTrue(store.exists(get_hash(node)))
+
+        restored = AddNode(3, 4)
+        restore_node_outputs(restored, store=store)
+        self.assertEqual(restored.outputs.a.value, 7)
+        self.assertEqual(restored.outputs.b.value, -1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from pyiron_workflow import Workflow
+
+from pyiron_database.instance_database import (
+    OutputStore,
+    OutputWriter,
+    SQLiteInstanceDatabase,
+    restore_node_outputs,
+    store_workflow_in_database,
+)
+
+from ..workflows import AddNode, diamond
+
+
+class TestOutputWriter(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        root = Path(self.directory.name)
+        self.store = OutputStore(str(root / "outputs"))
+        self.db = SQLiteInstanceDatabase(str(root / "nodes.db"))
+        self.db.init()
+
+    def tearDown(self) -> None:
+        self.db.close()
+        self.directory.cleanup()
+
+    def workflow(self) -> Workflow:
+        wf = diamond()
+        wf.run()
+        return wf
+
+    def test_submit(self) -> None:
+        node = AddNode(3, 4)
+        node.run()
+        with OutputWriter(self.store, max_pending_bytes=1) as writer:
+            future = writer.submit(node)
+            writer.flush()
+            self.assertEqual(writer.pending_bytes, 0)
+        self.assertTrue(Path(future.result()).exists())
+
+        restored = AddNode(3, 4)
+        restore_node_outputs(restored, store=self.store)
+        self.assertEqual(restored.outputs.a.value, 7)
+
+    def test_store_workflow(self) -> None:
+        wf = self.workflow()
+        with OutputWriter(self.store, max_workers=2) as writer:
+            hashes = store_workflow_in_database(
+                self.db, wf, store_outputs=True, writer=writer
+            )
+        for record in self.db.read_many(list(hashes.values())).values():
+            self.assertEqual(record.output_path, str(self.store.path(record.hash)))
+
+    def test_errors(self) -> None:
+        file = Path(self.directory.name) / "file"
+        file.touch()
+        node = AddNode(3, 4)
+        node.run()
+        writer = OutputWriter(OutputStore(str(file)))
+        writer.submit(node)
+        with self.assertRaises(OSError):
+            writer.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
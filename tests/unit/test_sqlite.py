@@ -0,0 +1,87 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from pyiron_workflow import Workflow
+
+from pyiron_database.instance_database import (
+    SQLiteInstanceDatabase,
+    restore_node_from_database,
+    restore_nodes_from_database,
+    store_node_in_database,
+    store_workflow_in_database,
+)
+
+from ..workflows import AddNode, diamond
+
+
+@Workflow.wrap.as_function_node()
+def Scale(x, factor=2.0):
+    y = x * factor
+    return y
+
+
+class TestSQLite(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.db = SQLiteInstanceDatabase(str(Path(self.directory.name) / "nodes.db"))
+        self.db.init()
+
+    def tearDown(self) -> None:
+        self.db.close()
+        self.directory.cleanup()
+
+    def test_idempotence_of_drop_init(self) -> None:
+        self.db.drop()
+        self.db.drop()
+        self.db.init()
+        self.db.init()
+
+    def test_node_store_restore(self) -> None:
+        node = AddNode(3, 4)
+
+        hash = store_node_in_database(
+            self.db, node, store_outputs=False, store_input_nodes_recursively=True
+        )
+
+        node_restored = restore_node_from_database(self.db, hash)
+        node_restored.run()
+        self.assertEqual(node_restored.outputs.a.value, 7)
+        self.assertEqual(node_restored.outputs.b.value, -1)
+
+    def test_workflow_store_restore(self) -> None:
+        wf = diamond()
+
+        hashes = store_workflow_in_database(self.db, wf)
+        self.assertEqual(len(self.db.read_many(list(hashes.values()))), 4)
+
+        nodes_restored = restore_nodes_from_database(self.db, [hashes[wf.bottom]])
+        self.assertEqual(len(nodes_restored), 4)
+        node_restored = nodes_restored[hashes[wf.bottom]]
+        node_restored.run_data_tree()
+        node_restored.run()
+        self.assertEqual(node_restored.outputs.a.value, 8)
+
+    def test_read_ancestors_non_finite_inputs(self) -> None:
+        wf = Workflow("non_finite")
+        wf.first = Scale(float("nan"))
+        wf.second = Scale(wf.first.outputs.y, float("inf"))
+        hashes = store_workflow_in_database(self.db, wf)
+
+        ancestors = self.db.read_ancestors([hashes[wf.second]])
+        self.assertEqual(set(ancestors), set(hashes.values()))
+
+    def test_update_delete(self) -> None:
+        hash = store_node_in_database(self.db, AddNode(3, 4))
+
+        self.db.update(hash, output_path="dummy.hdf5")
+        self.assertEqual(getattr(self.db.read(hash), "output_path", None), "dummy.hdf5")
+        with self.assertRaises(KeyError):
+            self.db.update(hash, unknown="value")
+
+        self.db.delete(hash)
+        self.assertIsNone(self.db.read(hash))
+
+
+if __name__ == "__main__":
+    unittest.main()
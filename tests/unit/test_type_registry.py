@@ -0,0 +1,56 @@
+import sys
+import types
+import unittest
+
+import numpy as np
+
+from pyiron_database.obj_reconstruction import TypeRegistry, get_type
+from pyiron_database.obj_reconstruction.util import recreate_type
+
+
+class Outer:
+    class Inner:
+        pass
+
+
+class TestTypeRegistry(unittest.TestCase):
+    def setUp(self) -> None:
+        self.registry = TypeRegistry()
+
+    def test_resolve(self) -> None:
+        self.assertIs(self.registry.resolve(__name__, "Outer.Inner"), Outer.Inner)
+        self.assertIs(
+            recreate_type(__name__, "Outer.Inner", "not_defined"), Outer.Inner
+        )
+        with self.assertRaises(AttributeError):
+            self.registry.resolve(__name__, "Outer.Missing")
+
+    def test_redefined(self) -> None:
+        module = types.ModuleType("notebook")
+        first, second = type("Cell", (), {}), type("Cell", (), {})
+        sys.modules["notebook"] = module
+        try:
+            module.Cell = first  # type: ignore[attr-defined]
+            self.assertIs(self.registry.resolve("notebook", "Cell"), first)
+            module.Cell = second  # type: ignore[attr-defined]
+            self.assertIs(self.registry.resolve("notebook", "Cell"), second)
+        finally:
+            del sys.modules["notebook"]
+
+    def test_register(self) -> None:
+        self.registry.register(Outer, "not.a.module", "Renamed")
+        self.assertIs(self.registry.resolve("not.a.module", "Renamed"), Outer)
+        self.registry.register_version("not", "1.0")
+        self.assertEqual(self.registry.version("not.a.module"), "1.0")
+        self.registry.clear()
+        with self.assertRaises(ModuleNotFoundError):
+            self.registry.resolve("not.a.module", "Renamed")
+
+    def test_version(self) -> None:
+        self.assertEqual(self.registry.version("numpy.linalg"), np.__version__)
+        self.assertEqual(get_type(np.zeros(1))[2], np.__version__)
+        self.assertEqual(self.registry.version(__name__), "not_defined")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,37 @@
+from pyiron_workflow import Workflow
+from pyiron_workflow.node import Node
+
+
+@Workflow.wrap.as_function_node()
+def AddNode(x: int = 1, y: int = 2) -> tuple[int, int]:
+    a = x + y
+    b = x - y
+    return a, b
+
+
+def diamond() -> Workflow:
+    """A workflow of four nodes, where bottom depends on top via left and right."""
+    wf = Workflow("diamond")
+    wf.top = AddNode(1, 2)
+    wf.left = AddNode(wf.top.outputs.a, 3)
+    wf.right = AddNode(wf.top.outputs.b, 3)
+    wf.bottom = AddNode(wf.left.outputs.a, wf.right.outputs.a)
+    return wf
+
+
+def chain(length: int) -> Node:
+    """The last of a chain of nodes, each connected to the previous one."""
+    node = AddNode(1, 2)
+    for _ in range(length - 1):
+        node = AddNode(node.outputs.a, 1)
+    return node
+
+
+def diamonds(count: int) -> Node:
+    """The last node of diamonds stacked on top of each other."""
+    node = AddNode(1, 2)
+    for _ in range(count):
+        left = AddNode(node.outputs.a, 1)
+        right = AddNode(node.outputs.b, 1)
+        node = AddNode(left.outputs.a, right.outputs.a)
+    return node